@@ -13,79 +13,149 @@ Usage:
 """
 
 import argparse
+import errno
+import io
 import os
+import signal
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Share helpers with scripts/cleanup_resources.py
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from _fs import fast_rmtree  # noqa: E402
+from _tap import TAP_PREFIX, get_tap_links  # noqa: E402
 
-def run_command(cmd, check=False):
-    """Run a command and return the result."""
+FIRECRACKER_BINARY = b"/usr/local/bin/firecracker"
+
+
+def run_command(argv, check=False):
+    """Run a command given as an argv list and return the result."""
     try:
         result = subprocess.run(
-            cmd, shell=True, capture_output=True, text=True, check=check, timeout=10
+            argv, capture_output=True, text=True, check=check, timeout=10
         )
         return result
     except subprocess.TimeoutExpired:
-        print(f"Command timed out: {cmd}")
+        print(f"Command timed out: {' '.join(argv)}")
         return None
     except subprocess.CalledProcessError as e:
         if check:
-            print(f"Command failed: {cmd}")
+            print(f"Command failed: {' '.join(argv)}")
             print(f"Error: {e.stderr}")
         return None
+    except OSError:
+        # Executable not found, mirrors the shell's "command not found"
+        return None
+
+
+def _iter_firecracker_pids():
+    """Yield PIDs of running Firecracker processes by scanning /proc."""
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                cmd = f.read()
+        except OSError:
+            continue
+        # cmdline is the NUL-separated argv. Match "firecracker --api-sock ..."
+        # or the installed binary, judged on argv[0] so that processes which
+        # merely mention these strings in their arguments are skipped.
+        argv0, _, rest = cmd.partition(b"\x00")
+        if argv0 != b"firecracker" and not argv0.endswith(b"/firecracker"):
+            continue
+        if b"--api-sock" in rest or argv0 == FIRECRACKER_BINARY:
+            yield int(entry.name)
 
 
 def kill_firecracker_processes():
     """Kill all running Firecracker processes."""
     print("Killing Firecracker processes...")
-    # Kill actual firecracker processes by finding and killing them
-    result = run_command(
-        "ps aux | grep -E 'firecracker --api-sock|/usr/local/bin/firecracker' | grep -v grep | awk '{print $2}' | xargs -r kill"
-    )
-    if result and result.returncode == 0:
-        print(f"  ✓ Killed Firecracker processes")
+    killed = 0
+    for pid in _iter_firecracker_pids():
+        try:
+            os.kill(pid, signal.SIGTERM)
+            killed += 1
+        except OSError as e:
+            if e.errno == errno.EPERM:
+                print(f"  ! Permission denied killing PID {pid}")
+            elif e.errno != errno.ESRCH:
+                print(f"  ! Failed to kill PID {pid}: {e}")
+
+    if killed:
+        print(f"  ✓ Killed {killed} Firecracker process(es)")
     else:
         print("  ! No Firecracker processes found or already killed")
 
 
 def check_firecracker_processes():
     """Check for remaining Firecracker processes."""
-    # Look for actual firecracker processes, excluding python scripts
-    result = run_command(
-        "ps aux | grep -E 'firecracker --api-sock|/usr/local/bin/firecracker' | grep -v grep | awk '{print $2}'"
-    )
-    if result and result.stdout.strip():
-        pids = result.stdout.strip().split("\n")
-        return [p for p in pids if p]
-    return []
+    return list(_iter_firecracker_pids())
 
 
-def delete_tap_devices():
-    """Delete all TAP devices starting with 'tap_'."""
-    print("Deleting TAP devices...")
-    result = run_command("ip link show | grep tap_")
+def get_tap_devices():
+    """Return the names of all TAP devices starting with 'tap_'."""
+    try:
+        from pyroute2 import IPRoute
+    except ImportError:
+        IPRoute = None
 
+    if IPRoute is not None:
+        with IPRoute() as ipr:
+            return [ifname for _, ifname in get_tap_links(ipr)]
+
+    result = run_command(["ip", "-o", "link", "show"])
+    tap_devices = []
     if result and result.returncode == 0:
-        tap_lines = result.stdout.strip().split("\n")
-        tap_devices = []
+        for line in result.stdout.splitlines():
+            # Lines look like "3418: tap_dhdofa0u: <NO-CARRIER,..."
+            parts = line.split(":", 2)
+            if len(parts) < 3:
+                continue
+            tap_name = parts[1].strip().split("@", 1)[0]
+            if tap_name.startswith(TAP_PREFIX):
+                tap_devices.append(tap_name)
+    return tap_devices
+
+
+def delete_tap_devices(tap_devices=None):
+    """Delete all TAP devices starting with 'tap_'.
+
+    Args:
+        tap_devices: Previously discovered TAP device names, to avoid a re-scan.
+    """
+    print("Deleting TAP devices...")
+    if tap_devices is None:
+        tap_devices = get_tap_devices()
 
-        for line in tap_lines:
-            if line and "tap_" in line:
-                # Extract device name from output like "3418: tap_dhdofa0u: <NO-CARRIER,..."
-                parts = line.split(":")
-                if len(parts) >= 2:
-                    tap_name = parts[1].strip().split()[0]
-                    tap_devices.append(tap_name)
+    if not tap_devices:
+        print("  ! No TAP devices found")
+        return
 
+    try:
+        from pyroute2 import IPRoute
+    except ImportError:
+        IPRoute = None
+
+    if IPRoute is None:
         for tap_name in tap_devices:
-            result = run_command(f"ip link delete {tap_name}")
+            result = run_command(["ip", "link", "delete", tap_name])
             if result and result.returncode == 0:
                 print(f"  ✓ Deleted TAP device: {tap_name}")
             else:
                 print(f"  ! Failed to delete TAP device: {tap_name}")
-    else:
-        print("  ! No TAP devices found")
+        return
+
+    with IPRoute() as ipr:
+        for tap_name in tap_devices:
+            try:
+                ipr.link("del", ifname=tap_name)
+                print(f"  ✓ Deleted TAP device: {tap_name}")
+            except Exception:
+                print(f"  ! Failed to delete TAP device: {tap_name}")
 
 
 def flush_nftables_rules():
@@ -93,8 +163,24 @@ def flush_nftables_rules():
     print("Flushing nftables rules...")
     chains = ["ip filter FORWARD", "ip nat PREROUTING", "ip nat POSTROUTING"]
 
+    # nft applies a script as a single transaction, so one invocation flushes
+    # every chain. If any chain is missing the whole batch is rejected, in which
+    # case fall back to flushing chains one by one to report which ones failed.
+    script = "".join(f"flush chain {chain}\n" for chain in chains)
+    try:
+        result = subprocess.run(
+            ["nft", "-f", "-"], input=script, capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        result = None
+
+    if result and result.returncode == 0:
+        for chain in chains:
+            print(f"  ✓ Flushed chain: {chain}")
+        return
+
     for chain in chains:
-        result = run_command(f"nft flush chain {chain}")
+        result = run_command(["nft", "flush", "chain", *chain.split()])
         if result and result.returncode == 0:
             print(f"  ✓ Flushed chain: {chain}")
         else:
@@ -118,21 +204,81 @@ def cleanup_firecracker_dirs():
         print("  ! No Firecracker directories to clean")
         return
 
+    vm_dirs = []
     for subdir in subdirs:
+        # Check if it's a VM directory (has socket or logs)
+        if (subdir / "firecracker.socket").exists() or (subdir / "logs").exists():
+            vm_dirs.append(subdir)
+        else:
+            print(f"  - Skipping non-VM directory: {subdir.name}")
+
+    if not vm_dirs:
+        return
+
+    def remove_dir(subdir):
         try:
-            # Check if it's a VM directory (has socket or logs)
-            socket_file = subdir / "firecracker.socket"
-            log_dir = subdir / "logs"
+            fast_rmtree(subdir)
+            return None
+        except Exception as e:
+            return e
 
-            if socket_file.exists() or log_dir.exists():
+    # Removal is bound by unlink/rmdir latency, so overlap it across directories
+    with ThreadPoolExecutor(max_workers=min(32, len(vm_dirs))) as executor:
+        for subdir, error in zip(vm_dirs, executor.map(remove_dir, vm_dirs)):
+            if error is None:
                 print(f"  ✓ Removing directory: {subdir.name}")
-                subprocess.run(
-                    f"rm -rf {subdir}", shell=True, capture_output=True, timeout=30
-                )
             else:
-                print(f"  - Skipping non-VM directory: {subdir.name}")
+                print(f"  ! Failed to remove directory {subdir.name}: {error}")
+
+
+class _ThreadStdout:
+    """sys.stdout proxy that routes each worker thread's prints to its own buffer."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def _target(self):
+        return getattr(self.local, "buffer", self.stream)
+
+    def write(self, data):
+        return self._target().write(data)
+
+    def flush(self):
+        self._target().flush()
+
+
+def run_concurrently(*tasks):
+    """Run tasks in parallel, printing their output in submission order.
+
+    Returns:
+        list: The return value of each task, in submission order
+    """
+    proxy = _ThreadStdout(sys.stdout)
+
+    def run(task):
+        proxy.local.buffer = io.StringIO()
+        try:
+            return task(), None, proxy.local.buffer.getvalue()
         except Exception as e:
-            print(f"  ! Failed to remove directory {subdir.name}: {e}")
+            return None, e, proxy.local.buffer.getvalue()
+        finally:
+            del proxy.local.buffer
+
+    sys.stdout = proxy
+    try:
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            outcomes = list(executor.map(run, tasks))
+    finally:
+        sys.stdout = proxy.stream
+
+    results = []
+    for result, error, output in outcomes:
+        sys.stdout.write(output)
+        if error is not None:
+            raise error
+        results.append(result)
+    return results
 
 
 def main():
@@ -164,46 +310,37 @@ def main():
         print("\nWARNING: Not running as root. Some operations may fail.")
         print("Consider running with: sudo python cleanup_firecracker.py\n")
 
-    # Kill Firecracker processes
     if not args.dry_run:
-        kill_firecracker_processes()
-        remaining = check_firecracker_processes()
-        if remaining:
-            print(f"  ! Still have {len(remaining)} Firecracker processes running")
-            print(f"  ! PIDs: {', '.join(remaining)}")
+        # Process kill, TAP deletion and the nftables flush touch independent
+        # kernel subsystems, so run them concurrently.
+        def kill_processes():
+            kill_firecracker_processes()
+            remaining = check_firecracker_processes()
+            if remaining:
+                print(f"  ! Still have {len(remaining)} Firecracker processes running")
+                print(f"  ! PIDs: {', '.join(map(str, remaining))}")
+
+        run_concurrently(
+            kill_processes,
+            delete_tap_devices,
+            flush_nftables_rules,
+        )
     else:
         pids = check_firecracker_processes()
         if pids:
             print(f"Would kill {len(pids)} Firecracker processes")
-            print(f"PIDs: {', '.join(pids)}")
+            print(f"PIDs: {', '.join(map(str, pids))}")
         else:
             print("No Firecracker processes to kill")
 
-    # Delete TAP devices
-    if not args.dry_run:
-        delete_tap_devices()
-    else:
-        result = run_command("ip link show | grep tap_")
-        if result and result.returncode == 0:
-            tap_lines = result.stdout.strip().split("\n")
-            tap_devices = []
-            for line in tap_lines:
-                if line and "tap_" in line:
-                    parts = line.split(":")
-                    if len(parts) >= 2:
-                        tap_name = parts[1].strip().split()[0]
-                        tap_devices.append(tap_name)
-            if tap_devices:
-                print(f"Would delete {len(tap_devices)} TAP devices:")
-                for tap in tap_devices:
-                    print(f"  - {tap}")
-            else:
-                print("No TAP devices to delete")
+        tap_devices = get_tap_devices()
+        if tap_devices:
+            print(f"Would delete {len(tap_devices)} TAP devices:")
+            for tap in tap_devices:
+                print(f"  - {tap}")
+        else:
+            print("No TAP devices to delete")
 
-    # Flush nftables rules
-    if not args.dry_run:
-        flush_nftables_rules()
-    else:
         print("Would flush nftables chains:")
         print("  - ip filter FORWARD")
         print("  - ip nat PREROUTING")
@@ -228,14 +365,13 @@ def main():
 
     # Show summary
     if not args.dry_run:
+        # Re-check now: processes signalled earlier have had time to exit
         remaining_pids = check_firecracker_processes()
-        tap_result = run_command("ip link show | grep tap_")
+        remaining_tap_devices = get_tap_devices()
 
         print("\nSummary:")
         print(f"  - Firecracker processes: {'Running' if remaining_pids else 'None'}")
-        print(
-            f"  - TAP devices: {'Found' if tap_result and tap_result.returncode == 0 else 'None'}"
-        )
+        print(f"  - TAP devices: {'Found' if remaining_tap_devices else 'None'}")
         print(f"  - nftables: Flushed")
 
         if remaining_pids:
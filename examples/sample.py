@@ -23,11 +23,17 @@ Enable IP forwarding:
 
 import os
 import sys
+import shutil
 import subprocess
 import socket
+import tempfile
 import time
 from firecracker import MicroVM
 
+# SSH master sockets live in a private (0700) directory, not world-writable /tmp
+SSH_CONTROL_DIR = tempfile.mkdtemp(prefix="fc-ssh-")
+SSH_CONTROL_PATH = os.path.join(SSH_CONTROL_DIR, "%r@%h:%p")
+
 
 def print_section(title):
     """Print a formatted section header."""
@@ -65,6 +71,17 @@ def find_available_subnet(used_subnets):
 
 def enable_ip_forwarding():
     """Enable IP forwarding on the host system."""
+    # Already root: write the sysctl directly instead of going through sudo sh -c
+    if os.geteuid() == 0:
+        try:
+            with open("/proc/sys/net/ipv4/ip_forward", "w") as f:
+                f.write("1\n")
+            print("✓ IP forwarding enabled")
+            return
+        except OSError as e:
+            print(f"WARNING: Failed to enable IP forwarding: {e}")
+            return
+
     try:
         subprocess.run(
             ["sudo", "sh", "-c", "echo 1 > /proc/sys/net/ipv4/ip_forward"],
@@ -79,6 +96,60 @@ def enable_ip_forwarding():
         )
 
 
+def ssh_command(vm, ssh_key, command):
+    """Build an ssh argv that shares one multiplexed connection per VM.
+
+    Args:
+        vm: MicroVM instance
+        ssh_key: Path to SSH private key
+        command: Shell command to run inside the VM
+
+    Returns:
+        list: Command line suitable for subprocess.run
+    """
+    return [
+        "ssh",
+        "-i",
+        ssh_key,
+        "-o",
+        "StrictHostKeyChecking=no",
+        "-o",
+        "ConnectTimeout=5",
+        "-o",
+        "ControlMaster=auto",
+        "-o",
+        f"ControlPath={SSH_CONTROL_PATH}",
+        "-o",
+        "ControlPersist=60s",
+        f"root@{vm._ip_addr}",
+        command,
+    ]
+
+
+def close_ssh_master(vm):
+    """Stop the multiplexed SSH master for a VM and remove its socket directory.
+
+    Args:
+        vm: MicroVM instance
+    """
+    try:
+        subprocess.run(
+            [
+                "ssh",
+                "-o",
+                f"ControlPath={SSH_CONTROL_PATH}",
+                "-O",
+                "exit",
+                f"root@{vm._ip_addr}",
+            ],
+            capture_output=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+    shutil.rmtree(SSH_CONTROL_DIR, ignore_errors=True)
+
+
 def configure_vm_network(vm, ssh_key):
     """Configure network settings inside the VM for internet access.
 
@@ -86,39 +157,28 @@ def configure_vm_network(vm, ssh_key):
         vm: MicroVM instance
         ssh_key: Path to SSH private key
     """
-    gateway_ip = vm._gateway_ip
-
     commands = [
-        f"echo 'nameserver 8.8.8.8' > /etc/resolv.conf",
-        f"echo 'nameserver 1.1.1.1' >> /etc/resolv.conf",
+        "echo 'nameserver 8.8.8.8' > /etc/resolv.conf",
+        "echo 'nameserver 1.1.1.1' >> /etc/resolv.conf",
     ]
+    script = "; ".join(commands)
 
-    for cmd in commands:
-        try:
-            result = subprocess.run(
-                [
-                    "ssh",
-                    "-i",
-                    ssh_key,
-                    "-o",
-                    "StrictHostKeyChecking=no",
-                    "-o",
-                    "ConnectTimeout=5",
-                    f"root@{vm._ip_addr}",
-                    cmd,
-                ],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            if result.returncode == 0:
+    try:
+        result = subprocess.run(
+            ssh_command(vm, ssh_key, script),
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        if result.returncode == 0:
+            for cmd in commands:
                 print(f"✓ Executed: {cmd}")
-            else:
-                print(f"WARNING: Failed to execute: {cmd}")
-        except subprocess.TimeoutExpired:
-            print(f"WARNING: Timeout while executing: {cmd}")
-        except Exception as e:
-            print(f"WARNING: Error executing '{cmd}': {e}")
+        else:
+            print(f"WARNING: Failed to execute: {script}")
+    except subprocess.TimeoutExpired:
+        print(f"WARNING: Timeout while executing: {script}")
+    except Exception as e:
+        print(f"WARNING: Error executing '{script}': {e}")
 
 
 def test_internet_access(vm, ssh_key):
@@ -137,17 +197,7 @@ def test_internet_access(vm, ssh_key):
     for url in test_urls:
         try:
             result = subprocess.run(
-                [
-                    "ssh",
-                    "-i",
-                    ssh_key,
-                    "-o",
-                    "StrictHostKeyChecking=no",
-                    "-o",
-                    "ConnectTimeout=5",
-                    f"root@{vm._ip_addr}",
-                    f"ping -c 3 {url}",
-                ],
+                ssh_command(vm, ssh_key, f"ping -c 3 {url}"),
                 capture_output=True,
                 text=True,
                 timeout=15,
@@ -263,6 +313,9 @@ def main():
             print(f"\n{result}")
 
             # If we get here, VM was created successfully
+            existing_vms.append(
+                {"id": vm._microvm_id, "ip_addr": vm._ip_addr, "state": "Running"}
+            )
             break
 
         except Exception as e:
@@ -299,30 +352,31 @@ def main():
     print("\nWaiting for VM to boot and SSH service to start...")
     print("(This may take 30-60 seconds for first boot)")
 
-    # Wait for SSH port to become available
+    # Wait for SSH port to become available, probing quickly at first and
+    # backing off to once per second so readiness is noticed promptly
     max_wait = 90  # Maximum wait time in seconds
-    wait_interval = 2  # Check every 2 seconds
     ssh_ready = False
+    start = time.monotonic()
+    deadline = start + max_wait
+    delay = 0.1
+    next_report = 10
 
-    for i in range(0, max_wait, wait_interval):
+    while time.monotonic() < deadline:
         try:
-            # Try to connect to SSH port
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex((vm._ip_addr, 22))
-            sock.close()
-
-            if result == 0:
-                ssh_ready = True
-                print(f"✓ SSH service is ready after {i} seconds")
-                break
-            else:
-                if i % 10 == 0:
-                    print(f"Still booting... ({i}s elapsed)")
-        except Exception:
+            socket.create_connection((vm._ip_addr, 22), timeout=0.5).close()
+            ssh_ready = True
+            print(f"✓ SSH service is ready after {time.monotonic() - start:.1f} seconds")
+            break
+        except OSError:
             pass
 
-        time.sleep(wait_interval)
+        elapsed = time.monotonic() - start
+        if elapsed >= next_report:
+            print(f"Still booting... ({int(elapsed)}s elapsed)")
+            next_report += 10
+
+        time.sleep(delay)
+        delay = min(delay * 1.5, 1.0)
 
     if not ssh_ready:
         print(f"WARNING: SSH port not responding after {max_wait} seconds")
@@ -333,24 +387,27 @@ def main():
     print_section("Enabling Internet Access")
     enable_ip_forwarding()
 
-    # Configure DNS in the VM
-    print("\nConfiguring DNS in the VM...")
-    configure_vm_network(vm, SSH_KEY)
+    try:
+        # Configure DNS in the VM
+        print("\nConfiguring DNS in the VM...")
+        configure_vm_network(vm, SSH_KEY)
 
-    # Test internet connectivity
-    print("\nTesting internet connectivity...")
-    test_internet_access(vm, SSH_KEY)
+        # Test internet connectivity
+        print("\nTesting internet connectivity...")
+        test_internet_access(vm, SSH_KEY)
+    finally:
+        # Don't leave the background SSH master running after the checks
+        close_ssh_master(vm)
 
     # Get VM status
     print_section("VM Status")
     status = vm.status()
     print(status)
 
-    # List VMs again to confirm
+    # Reuse the initial listing, which already includes the new VM
     print_section("Listing All VMs")
-    all_vms = MicroVM.list()
-    print(f"Total VMs: {len(all_vms)}")
-    for v in all_vms:
+    print(f"Total VMs: {len(existing_vms)}")
+    for v in existing_vms:
         print(f"  - ID: {v['id']}, IP: {v['ip_addr']}, State: {v['state']}")
 
     # Optional: Connect via SSH
@@ -6,9 +6,10 @@ import json
 import re
 import select
 import termios
-import docker
 import tarfile
+import functools
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from typing import List, Dict
 from firecracker.config import MicroVMConfig
@@ -28,6 +29,60 @@ from firecracker.exceptions import VMMError, ConfigurationError
 from paramiko import SSHClient, AutoAddPolicy, SSHException
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
 
+_MIN_MEMORY = 128  # Minimum memory size in MiB
+
+# Optional sign, decimal number and an optional M (MiB) or G (GiB) unit
+_MEMORY_SIZE_RE = re.compile(
+    r"^\s*([-+]?(?:\d+(?:\.\d*)?|\.\d+))\s*([MG]?)\s*$", re.IGNORECASE
+)
+_MEMORY_UNIT_MIB = {"": 1, "M": 1, "G": 1024}
+
+# A comma-separated port list entry made only of digits
+_PORT_TOKEN_RE = re.compile(r"(?:^|,)\s*(\d+)\s*(?=,|$)")
+
+
+def _read_user_data_file(path: str) -> str:
+    """Return the contents of a cloud-init user data file.
+
+    Raises:
+        ValueError: If the file does not exist.
+    """
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise ValueError(f"User data file not found: {path}")
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_memory_size(size: str) -> int:
+    """Return a memory size string such as '512', '1G' or '1.5g' in MiB.
+
+    Configurations repeat the same few strings, so results are cached.
+
+    Raises:
+        ValueError: If the string is not a number with an optional M or G unit.
+    """
+    match = _MEMORY_SIZE_RE.match(size)
+    if not match:
+        raise ValueError(f"Invalid memory size format: {size.upper().strip()}")
+
+    number, unit = match.groups()
+    mem_size = int(float(number) * _MEMORY_UNIT_MIB[unit.upper()])
+    return max(mem_size, _MIN_MEMORY)
+
+
+@functools.lru_cache(maxsize=1)
+def _docker_client():
+    """Return a Docker client shared by all MicroVM instances.
+
+    Docker is imported and contacted on first use only, so VMs that boot from
+    an existing rootfs never need a running Docker daemon.
+    """
+    import docker
+
+    return docker.from_env()
+
 
 class MicroVM:
     """A class to manage Firecracker microVMs.
@@ -124,10 +179,7 @@ class MicroVM:
                 "Cannot specify both user_data and user_data_file. Use only one of them."
             )
         if user_data_file:
-            if not os.path.exists(user_data_file):
-                raise ValueError(f"User data file not found: {user_data_file}")
-            with open(user_data_file, "r") as f:
-                self._user_data = f.read()
+            self._user_data = _read_user_data_file(user_data_file)
         else:
             self._user_data = user_data
 
@@ -151,7 +203,6 @@ class MicroVM:
         self._log_dir = f"{self._vmm_dir}/logs"
         self._rootfs_dir = f"{self._vmm_dir}/rootfs"
 
-        self._docker = docker.from_env()
         self._docker_image = image
 
         if image:
@@ -272,9 +323,7 @@ class MicroVM:
             return "VMM ID not exist"
 
         try:
-            with open(config_file, "r") as f:
-                config = json.load(f)
-                return config
+            return self._load_config(id)
         except Exception as e:
             raise VMMError(f"Failed to inspect VMM {id}: {str(e)}")
 
@@ -532,9 +581,11 @@ class MicroVM:
                 return "No VMMs available to delete"
 
             if all:
-                for vmm in vmm_list:
-                    self._vmm.delete_vmm(vmm["id"])
-                
+                # Process stops and directory removals overlap; nftables
+                # teardown is serialized inside NetworkManager.cleanup
+                with ThreadPoolExecutor(max_workers=min(8, len(vmm_list))) as executor:
+                    list(executor.map(self._vmm.delete_vmm, [vmm["id"] for vmm in vmm_list]))
+
                 # Clean up orphaned resources from VMs that failed during creation
                 self._vmm.cleanup_orphaned_resources()
                 
@@ -669,12 +720,10 @@ class MicroVM:
             if id not in available_vmm_ids:
                 return f"VMM with ID {id} does not exist"
 
-            config_path = f"{self._config.data_path}/{id}/config.json"
-            with open(config_path, "r") as f:
-                config = json.load(f)
-                if "Network" not in config or f"tap_{id}" not in config["Network"]:
-                    raise VMMError(f"Network configuration not found for VMM {id}")
-                dest_ip = config["Network"][f"tap_{id}"]["IPAddress"]
+            config = self._load_config(id)
+            if "Network" not in config or f"tap_{id}" not in config["Network"]:
+                raise VMMError(f"Network configuration not found for VMM {id}")
+            dest_ip = config["Network"][f"tap_{id}"]["IPAddress"]
 
             if not dest_ip:
                 raise VMMError(
@@ -1087,12 +1136,7 @@ class MicroVM:
             return [port_value]
 
         if isinstance(port_value, str):
-            if "," in port_value:
-                return [
-                    int(p.strip()) for p in port_value.split(",") if p.strip().isdigit()
-                ]
-            elif port_value.isdigit():
-                return [int(port_value)]
+            return [int(p) for p in _PORT_TOKEN_RE.findall(port_value)]
 
         if isinstance(port_value, list):
             ports = []
@@ -1105,6 +1149,11 @@ class MicroVM:
 
         return []
 
+    @property
+    def _docker(self):
+        """Docker client, created lazily and shared across instances."""
+        return _docker_client()
+
     @property
     def _boot_args(self):
         """Generate boot arguments using current configuration.
@@ -1406,8 +1455,10 @@ class MicroVM:
                 self._logger.info(f"Kernel file downloaded successfully: {path}")
 
         except Exception as e:
-            if os.path.exists(path):
+            try:
                 os.remove(path)
+            except FileNotFoundError:
+                pass
             raise VMMError(f"Failed to download kernel from {url}: {str(e)}")
 
     @staticmethod
@@ -1420,27 +1471,11 @@ class MicroVM:
         Returns:
             int: Memory size in MiB
         """
-        MIN_MEMORY = 128  # Minimum memory size in MiB
-
         if isinstance(size, int):
-            return max(size, MIN_MEMORY)
+            return max(size, _MIN_MEMORY)
 
         if isinstance(size, str):
-            size = size.upper().strip()
-            try:
-                if size.endswith("G"):
-                    # Convert GB to MiB and ensure minimum
-                    mem_size = int(float(size[:-1]) * 1024)
-                elif size.endswith("M"):
-                    # Already in MiB, just convert
-                    mem_size = int(float(size[:-1]))
-                else:
-                    # If no unit specified, assume MiB
-                    mem_size = int(float(size))
-
-                return max(mem_size, MIN_MEMORY)
-            except ValueError:
-                raise ValueError(f"Invalid memory size format: {size}")
+            return _parse_memory_size(size)
         raise ValueError(f"Invalid memory size type: {type(size)}")
 
     def _is_valid_docker_image(self, name: str) -> bool:
@@ -1453,6 +1488,8 @@ class MicroVM:
         Returns:
             bool: True if image exists locally or in registry, False otherwise
         """
+        import docker
+
         try:
             try:
                 local_image = self._docker.images.get(name)
@@ -1485,6 +1522,8 @@ class MicroVM:
         Raises:
             VMMError: If Docker operations fail
         """
+        import docker
+
         try:
             local = self._docker.images.get(image)
             if self._config.verbose:
@@ -1518,6 +1557,8 @@ class MicroVM:
         Returns:
             str: Path to the exported tar file
         """
+        import docker
+
         container_name = image.split("/")[-1].replace(":", "-")
         tar_file = f"{self._config.data_path}/rootfs_{container_name}.tar"
 
@@ -1534,9 +1575,10 @@ class MicroVM:
             if self._config.verbose:
                 self._logger.debug(f"Exporting container to {tar_file}")
 
-            with open(tar_file, "wb") as f:
-                for chunk in export_data:
-                    f.write(chunk)
+            # export() streams the tar in chunks; writelines drains the
+            # generator in C and the 1 MiB buffer coalesces small chunks
+            with open(tar_file, "wb", buffering=1 << 20) as f:
+                f.writelines(export_data)
 
             container.remove(force=True)
 
@@ -1633,6 +1675,30 @@ class MicroVM:
             key_filename=key_path,
         )
 
+    def _load_config(self, id: str) -> dict:
+        """Read and parse config.json of a VMM.
+
+        Args:
+            id (str): ID of the VMM
+
+        Returns:
+            dict: The VMM configuration
+        """
+        config_path = f"{self._config.data_path}/{id}/config.json"
+        with open(config_path, "r") as f:
+            return json.load(f)
+
+    def _save_config(self, id: str, config: dict):
+        """Write config.json of a VMM.
+
+        Args:
+            id (str): ID of the VMM
+            config (dict): The VMM configuration to write
+        """
+        config_path = f"{self._config.data_path}/{id}/config.json"
+        with open(config_path, "w") as f:
+            json.dump(config, f)
+
     def _setup_port_forwarding(
         self, host_ports, dest_ports, vmm_id=None, dest_ip=None, update_config=True
     ):
@@ -1680,16 +1746,9 @@ class MicroVM:
         if update_config:
             config_path = f"{self._config.data_path}/{vmm_id}/config.json"
             if os.path.exists(config_path):
-                with open(config_path, "r") as f:
-                    config = json.load(f)
-
-                if "Ports" not in config:
-                    config["Ports"] = {}
-
-                config["Ports"].update(ports_config)
-
-                with open(config_path, "w") as f:
-                    json.dump(config, f)
+                config = self._load_config(vmm_id)
+                config.setdefault("Ports", {}).update(ports_config)
+                self._save_config(vmm_id, config)
 
                 if self._config.verbose:
                     self._logger.debug(
@@ -1730,14 +1789,10 @@ class MicroVM:
         if update_config:
             config_path = f"{self._config.data_path}/{vmm_id}/config.json"
             if os.path.exists(config_path):
-                with open(config_path, "r") as f:
-                    config = json.load(f)
-
+                config = self._load_config(vmm_id)
                 for dest_port in dest_ports_list:
                     config["Ports"].pop(f"{dest_port}/tcp", None)
-
-                with open(config_path, "w") as f:
-                    json.dump(config, f)
+                self._save_config(vmm_id, config)
 
         if self._config.verbose:
             self._logger.info(f"Port forwarding removed successfully for VMM {vmm_id}")
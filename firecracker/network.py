@@ -1,6 +1,8 @@
 import os
 import sys
 import ipaddress
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pyroute2 import IPRoute
 from firecracker.logger import Logger
 from firecracker.utils import run
@@ -33,6 +35,8 @@ class NetworkManager:
             self._nft.set_json_output(True)
         else:
             self._nft = None
+        # libnftables contexts are not thread-safe; serializes concurrent teardowns
+        self._nft_lock = threading.Lock()
 
         self._ipr = IPRoute()
         self._logger = Logger(level=level, verbose=verbose)
@@ -578,13 +582,22 @@ class NetworkManager:
         except Exception as e:
             raise NetworkError(f"Failed to get nftables rules: {str(e)}")
 
-    def get_port_forward_by_comment(self, id: str, host_port: int, dest_port: int):
+    def _list_nat_table(self):
+        """Return the items of the ip nat table listing."""
+        list_cmd = {"nftables": [{"list": {"table": {"family": "ip", "name": "nat"}}}]}
+        output = self._nft.json_cmd(list_cmd)
+        return output[1]["nftables"]
+
+    def get_port_forward_by_comment(
+        self, id: str, host_port: int, dest_port: int, nat_items=None
+    ):
         """Get port forwarding rules by matching the comment pattern.
 
         Args:
             id (str): Machine ID to search for
             host_port (int): Host port to search for
             dest_port (int): Destination port to search for
+            nat_items (list, optional): Pre-fetched nat table listing to search
 
         Returns:
             dict: Dictionary containing handles for prerouting rules only.
@@ -592,11 +605,8 @@ class NetworkManager:
         Raises:
             NetworkError: If retrieving nftables rules fails.
         """
-        list_cmd = {"nftables": [{"list": {"table": {"family": "ip", "name": "nat"}}}]}
-
         try:
-            output = self._nft.json_cmd(list_cmd)
-            result = output[1]["nftables"]
+            result = self._list_nat_table() if nat_items is None else nat_items
             rules = {}
 
             prerouting_comment = (
@@ -637,21 +647,18 @@ class NetworkManager:
         except Exception as e:
             raise NetworkError(f"Failed to get nftables rules: {str(e)}")
 
-    def _check_postrouting_exists(self, id: str) -> bool:
+    def _check_postrouting_exists(self, id: str, nat_items=None) -> bool:
         """Check if a POSTROUTING rule already exists for the given machine ID.
 
         Args:
             id (str): Machine ID to check for
+            nat_items (list, optional): Pre-fetched nat table listing to search
 
         Returns:
             bool: True if POSTROUTING rule exists, False otherwise
         """
         try:
-            list_cmd = {
-                "nftables": [{"list": {"table": {"family": "ip", "name": "nat"}}}]
-            }
-            output = self._nft.json_cmd(list_cmd)
-            result = output[1]["nftables"]
+            result = self._list_nat_table() if nat_items is None else nat_items
 
             postrouting_comment = f"machine_id={id}"
 
@@ -719,15 +726,23 @@ class NetworkManager:
         except ValueError:
             raise NetworkError(f"Invalid IP address: {host_ip}")
 
+        # List the nat table once for both the PREROUTING and POSTROUTING checks
+        try:
+            nat_items = self._list_nat_table()
+        except Exception as e:
+            raise NetworkError(f"Failed to get nftables rules: {str(e)}") from e
+
         # First check if the PREROUTING rule already exists
-        existing_rules = self.get_port_forward_by_comment(id, host_port, dest_port)
+        existing_rules = self.get_port_forward_by_comment(
+            id, host_port, dest_port, nat_items
+        )
         if existing_rules:
             if self._config.verbose:
                 self._logger.info("Port forwarding rules already exist")
             return True
 
         # Check if POSTROUTING rule already exists
-        postrouting_exists = self._check_postrouting_exists(id)
+        postrouting_exists = self._check_postrouting_exists(id, nat_items)
 
         # Create the rules
         rules = {
@@ -843,16 +858,20 @@ class NetworkManager:
                 }
             )
 
+        ignore_errors = ["File exists", "already exists"]
+
         try:
-            for rule in rules["nftables"]:
-                rc, _, error = self._nft.json_cmd({"nftables": [rule]})
-                if rc != 0:
-                    error_str = str(error)
-                    ignore_errors = [
-                        "File exists",
-                        "already exists",
-                    ]
-                    if not any(err in error_str for err in ignore_errors):
+            # Commit table, chains and rules in one transaction; if it is rejected
+            # only because something already exists, retry rule by rule so the
+            # remaining rules still get added.
+            rc, _, error = self._nft.json_cmd(rules)
+            if rc != 0:
+                if not any(err in str(error) for err in ignore_errors):
+                    raise NetworkError(f"Failed to add port forwarding rule: {error}")
+
+                for rule in rules["nftables"]:
+                    rc, _, error = self._nft.json_cmd({"nftables": [rule]})
+                    if rc != 0 and not any(err in str(error) for err in ignore_errors):
                         raise NetworkError(
                             f"Failed to add port forwarding rule: {error}"
                         )
@@ -968,35 +987,13 @@ class NetworkManager:
                 {"nftables": [{"list": {"table": {"family": "ip", "name": "nat"}}}]}
             )
             rules = output[1]["nftables"]
+            comment = f"machine_id={id} host_port={host_port} vm_port={dest_port}"
 
-            for item in rules:
-                if "rule" not in item:
-                    continue
-
-                rule = item["rule"]
-                comment = rule.get("comment", "")
-
-                comment_matches = (
-                    f"machine_id={id} host_port={host_port} vm_port={dest_port}"
-                    in comment
-                )
-
-                if comment_matches:
-                    chain = rule.get("chain", "").upper()
-                    handle = rule["handle"]
-
-                    cmd = f"delete rule nat {chain} handle {handle}"
-                    rc, _, error = self._nft.cmd(cmd)
-
-                    if self._config.verbose:
-                        if rc == 0:
-                            self._logger.debug(
-                                f"{chain} rule with handle {handle} deleted"
-                            )
-                        else:
-                            self._logger.warn(
-                                f"Error deleting {chain} rule with handle {handle}: {error}"
-                            )
+            self._delete_nat_rules_by_handle(
+                (item["rule"]["chain"], item["rule"]["handle"])
+                for item in rules
+                if "rule" in item and comment in item["rule"].get("comment", "")
+            )
 
             if self._config.verbose:
                 self._logger.info(
@@ -1006,6 +1003,36 @@ class NetworkManager:
         except Exception as e:
             raise NetworkError(f"Failed to delete port forward rules: {str(e)}")
 
+    def _delete_nat_rules_by_handle(self, chain_handles):
+        """Delete nat table rules in a single nftables transaction.
+
+        Args:
+            chain_handles: Iterable of (chain, handle) pairs to delete.
+        """
+        commands = [
+            {
+                "delete": {
+                    "rule": {
+                        "family": "ip",
+                        "table": "nat",
+                        "chain": chain,
+                        "handle": handle,
+                    }
+                }
+            }
+            for chain, handle in chain_handles
+        ]
+        if not commands:
+            return
+
+        rc, _, error = self._nft.json_cmd({"nftables": commands})
+
+        if self._config.verbose:
+            if rc == 0:
+                self._logger.debug(f"Deleted {len(commands)} nat rules")
+            else:
+                self._logger.warn(f"Error deleting nat rules: {error}")
+
     def delete_all_port_forward(self, id: str):
         """Delete all port forwarding rules for a given machine ID.
 
@@ -1020,46 +1047,29 @@ class NetworkManager:
         try:
             output = self._nft.json_cmd(list_cmd)
             result = output[1]["nftables"]
-            rules_to_delete = {}
+            rules_to_delete = []
 
             for item in result:
                 if "rule" not in item:
                     continue
 
                 rule = item["rule"]
-                chain = rule.get("chain", "").upper()
+                chain = rule.get("chain", "")
                 comment = rule.get("comment", "")
 
-                if comment and f"machine_id={id}" in comment:
-                    if chain == "PREROUTING":
-                        if "prerouting" not in rules_to_delete:
-                            rules_to_delete["prerouting"] = []
-                        rules_to_delete["prerouting"].append(rule["handle"])
-                    elif chain == "POSTROUTING":
-                        if "postrouting" not in rules_to_delete:
-                            rules_to_delete["postrouting"] = []
-                        rules_to_delete["postrouting"].append(rule["handle"])
+                if (
+                    comment
+                    and f"machine_id={id}" in comment
+                    and chain.upper() in ("PREROUTING", "POSTROUTING")
+                ):
+                    rules_to_delete.append((chain, rule["handle"]))
 
             if not rules_to_delete:
                 if self._config.verbose:
                     self._logger.info("No port forwarding rules found")
                 return
 
-            for chain, handles in rules_to_delete.items():
-                for handle in handles:
-                    cmd = f"delete rule nat {chain.upper()} handle {handle}"
-                    rc, output, error = self._nft.cmd(cmd)
-
-                    if self._config.verbose:
-                        if rc == 0:
-                            self._logger.debug(
-                                f"{chain} rule with handle {handle} deleted"
-                            )
-                            self._logger.info("Deleted port forwarding rules")
-                        else:
-                            self._logger.warn(
-                                f"Error deleting {chain} rule with handle {handle}: {error}"
-                            )
+            self._delete_nat_rules_by_handle(rules_to_delete)
 
             if self._config.verbose:
                 self._logger.info(f"Deleted all port forwarding rules for {id}")
@@ -1222,40 +1232,49 @@ class NetworkManager:
             running_vm_ids (set): Set of VM IDs that are currently running
         """
         try:
-            links = self._ipr.get_links()
-            cleaned_count = 0
-            
-            for link in links:
-                ifname = link.get("ifname", "")
-                if ifname.startswith("tap_"):
-                    machine_id = ifname[4:]  # Remove 'tap_' prefix
-                    
-                    # If this TAP doesn't belong to a running VM, clean it
-                    if machine_id not in running_vm_ids:
-                        self._logger.info(f"Cleaning orphaned TAP device {ifname}")
-                        
-                        # Best-effort cleanup of all associated resources
-                        try:
-                            self.delete_nat_rules(ifname)
-                        except Exception as e:
-                            if self._config.verbose:
-                                self._logger.warn(f"Failed to delete NAT rules for orphaned {ifname}: {e}")
-                        
-                        try:
-                            self.delete_all_port_forward(machine_id)
-                        except Exception as e:
-                            if self._config.verbose:
-                                self._logger.warn(f"Failed to delete port forwarding for orphaned {ifname}: {e}")
-                        
-                        try:
-                            self.delete_tap(ifname)
-                            cleaned_count += 1
-                            if self._config.verbose:
-                                self._logger.info(f"Deleted orphaned TAP device {ifname}")
-                        except Exception as e:
-                            if self._config.verbose:
-                                self._logger.warn(f"Failed to delete orphaned TAP device {ifname}: {e}")
-            
+            # Map machine ID -> TAP name, then diff against the running set in one pass.
+            tap_ids = {
+                ifname[4:]: ifname
+                for ifname in (link.get("ifname", "") for link in self._ipr.get_links())
+                if ifname.startswith("tap_")
+            }
+            # Steady state: every TAP belongs to a running VM, nothing to tear down
+            orphans = tap_ids.keys() - running_vm_ids
+            if not orphans:
+                return
+
+            def teardown(machine_id):
+                ifname = tap_ids[machine_id]
+                self._logger.info(f"Cleaning orphaned TAP device {ifname}")
+
+                # Best-effort cleanup of all associated resources; netlink
+                # TAP deletions below overlap, nftables calls are serialized
+                with self._nft_lock:
+                    try:
+                        self.delete_nat_rules(ifname)
+                    except Exception as e:
+                        if self._config.verbose:
+                            self._logger.warn(f"Failed to delete NAT rules for orphaned {ifname}: {e}")
+
+                    try:
+                        self.delete_all_port_forward(machine_id)
+                    except Exception as e:
+                        if self._config.verbose:
+                            self._logger.warn(f"Failed to delete port forwarding for orphaned {ifname}: {e}")
+
+                try:
+                    self.delete_tap(ifname)
+                    if self._config.verbose:
+                        self._logger.info(f"Deleted orphaned TAP device {ifname}")
+                    return True
+                except Exception as e:
+                    if self._config.verbose:
+                        self._logger.warn(f"Failed to delete orphaned TAP device {ifname}: {e}")
+                    return False
+
+            with ThreadPoolExecutor(max_workers=min(32, len(orphans))) as executor:
+                cleaned_count = sum(executor.map(teardown, orphans))
+
             if cleaned_count > 0:
                 self._logger.info(f"Cleaned up {cleaned_count} orphaned TAP device(s)")
             
@@ -1273,37 +1292,38 @@ class NetworkManager:
         """
         cleanup_errors = []
         
-        # Step 1: Delete NAT rules (best effort)
-        try:
-            self.delete_nat_rules(tap_device)
-            if self._config.verbose:
-                self._logger.debug(f"Deleted NAT rules for {tap_device}")
-        except Exception as e:
-            cleanup_errors.append(f"Failed to delete NAT rules: {str(e)}")
-            if self._config.verbose:
-                self._logger.warn(f"Failed to delete NAT rules for {tap_device}: {e}")
-        
-        # Step 2: Delete masquerade (best effort)
-        try:
-            self.delete_masquerade()
-            if self._config.verbose:
-                self._logger.debug("Deleted masquerade rule")
-        except Exception as e:
-            cleanup_errors.append(f"Failed to delete masquerade: {str(e)}")
-            if self._config.verbose:
-                self._logger.warn(f"Failed to delete masquerade: {e}")
-        
-        # Step 3: Delete port forwarding (best effort)
-        try:
-            machine_id = tap_device[4:]
-            self.delete_all_port_forward(machine_id)
-            if self._config.verbose:
-                self._logger.debug(f"Deleted port forwarding for {machine_id}")
-        except Exception as e:
-            cleanup_errors.append(f"Failed to delete port forwarding: {str(e)}")
-            if self._config.verbose:
-                self._logger.warn(f"Failed to delete port forwarding: {e}")
-        
+        with self._nft_lock:
+            # Step 1: Delete NAT rules (best effort)
+            try:
+                self.delete_nat_rules(tap_device)
+                if self._config.verbose:
+                    self._logger.debug(f"Deleted NAT rules for {tap_device}")
+            except Exception as e:
+                cleanup_errors.append(f"Failed to delete NAT rules: {str(e)}")
+                if self._config.verbose:
+                    self._logger.warn(f"Failed to delete NAT rules for {tap_device}: {e}")
+
+            # Step 2: Delete masquerade (best effort)
+            try:
+                self.delete_masquerade()
+                if self._config.verbose:
+                    self._logger.debug("Deleted masquerade rule")
+            except Exception as e:
+                cleanup_errors.append(f"Failed to delete masquerade: {str(e)}")
+                if self._config.verbose:
+                    self._logger.warn(f"Failed to delete masquerade: {e}")
+
+            # Step 3: Delete port forwarding (best effort)
+            try:
+                machine_id = tap_device[4:]
+                self.delete_all_port_forward(machine_id)
+                if self._config.verbose:
+                    self._logger.debug(f"Deleted port forwarding for {machine_id}")
+            except Exception as e:
+                cleanup_errors.append(f"Failed to delete port forwarding: {str(e)}")
+                if self._config.verbose:
+                    self._logger.warn(f"Failed to delete port forwarding: {e}")
+
         # Step 4: Delete TAP device (always try this, even if other steps failed)
         try:
             self.delete_tap(tap_device)
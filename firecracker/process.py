@@ -54,19 +54,18 @@ class ProcessManager:
                 preexec_fn=lambda: os.setpgid(0, parent_pgid),
             )
 
-            time.sleep(0.5)
-
-            if process.poll() is not None:
+            # Popen.wait() returns as soon as the child exits, so the timeout
+            # is only spent in full when Firecracker starts successfully
+            try:
+                process.wait(timeout=0.5)
+            except subprocess.TimeoutExpired:
+                pass
+            else:
                 raise ProcessError("Firecracker process exited during startup")
 
-            proc = psutil.Process(process.pid)
-            if proc.status() == psutil.STATUS_ZOMBIE:
-                raise ProcessError("Firecracker process became defunct")
-
             try:
-                proc.wait(timeout=1)
-            except psutil.TimeoutExpired:
-                pass
+                if psutil.Process(process.pid).status() == psutil.STATUS_ZOMBIE:
+                    raise ProcessError("Firecracker process became defunct")
             except psutil.NoSuchProcess:
                 raise ProcessError("Firecracker process disappeared during startup")
 
@@ -90,26 +89,28 @@ class ProcessManager:
     )
     def is_running(self, id: str) -> bool:
         """Check if Firecracker is running."""
+        pid_file = f"{self._config.data_path}/{id}/firecracker.pid"
         try:
-            if os.path.exists(f"{self._config.data_path}/{id}/firecracker.pid"):
-                with open(f"{self._config.data_path}/{id}/firecracker.pid", "r") as f:
+            try:
+                with open(pid_file, "r") as f:
                     pid = int(f.read().strip())
-
-                try:
-                    os.kill(pid, 0)
-                    if self._logger.verbose:
-                        self._logger.debug(f"Firecracker is running with PID: {pid}")
-                    return True
-                except OSError:
-                    if self._logger.verbose:
-                        self._logger.info("Firecracker is not running (stale PID file)")
-                    os.remove(f"{self._config.data_path}/{id}/firecracker.pid")
-                    return False
-            else:
+            except FileNotFoundError:
                 if self._logger.verbose:
                     self._logger.info("Firecracker is not running")
                 return False
 
+            # Signal 0 only checks that the PID exists, without reading /proc
+            try:
+                os.kill(pid, 0)
+                if self._logger.verbose:
+                    self._logger.debug(f"Firecracker is running with PID: {pid}")
+                return True
+            except OSError:
+                if self._logger.verbose:
+                    self._logger.info("Firecracker is not running (stale PID file)")
+                os.remove(pid_file)
+                return False
+
         except Exception as e:
             if self._logger.verbose:
                 self._logger.error(f"Error checking status: {e}")
@@ -327,27 +328,22 @@ class ProcessManager:
         Args:
             id (str): The VM ID
         """
-        # Clean up PID file
-        pid_file = f"{self._config.data_path}/{id}/firecracker.pid"
-        if os.path.exists(pid_file):
+        for name, label in (
+            ("firecracker.pid", "PID file"),
+            ("firecracker.socket", "socket file"),
+        ):
+            # Unlink directly rather than checking os.path.exists() first
             try:
-                os.remove(pid_file)
-                if self._logger.verbose:
-                    self._logger.debug(f"Removed PID file for VM {id}")
+                os.remove(f"{self._config.data_path}/{id}/{name}")
+            except FileNotFoundError:
+                continue
             except OSError as e:
                 if self._logger.verbose:
-                    self._logger.warn(f"Failed to remove PID file: {e}")
+                    self._logger.warn(f"Failed to remove {label}: {e}")
+                continue
 
-        # Clean up socket file
-        socket_path = f"{self._config.data_path}/{id}/firecracker.socket"
-        if os.path.exists(socket_path):
-            try:
-                os.remove(socket_path)
-                if self._logger.verbose:
-                    self._logger.debug(f"Removed socket file: {socket_path}")
-            except OSError as e:
-                if self._logger.verbose:
-                    self._logger.warn(f"Failed to remove socket file: {e}")
+            if self._logger.verbose:
+                self._logger.debug(f"Removed {label} for VM {id}")
 
     def get_pid(self, id: str) -> tuple:
         """Get the PID of the Firecracker process.
@@ -413,19 +409,18 @@ class ProcessManager:
         pid_list = []
 
         try:
-            for pid in psutil.pids():
-                try:
-                    proc = psutil.Process(pid)
-                    if proc.name() == "firecracker":
-                        cmdline = proc.cmdline()
-                        if cmdline and len(cmdline) > 1 and "--api-sock" in cmdline:
-                            pid_list.append(pid)
-                except (
-                    psutil.NoSuchProcess,
-                    psutil.AccessDenied,
-                    psutil.ZombieProcess,
+            # attrs makes psutil fetch every field in one pass per process;
+            # fields it cannot read are reported as None instead of raising
+            for proc in psutil.process_iter(attrs=["pid", "name", "cmdline"]):
+                info = proc.info
+                cmdline = info["cmdline"]
+                if (
+                    info["name"] == "firecracker"
+                    and cmdline
+                    and len(cmdline) > 1
+                    and "--api-sock" in cmdline
                 ):
-                    continue
+                    pid_list.append(info["pid"])
 
         except Exception as e:
             raise ProcessError(f"Failed to get Firecracker processes: {str(e)}")
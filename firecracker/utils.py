@@ -1,13 +1,26 @@
 import os
+import re
+import time
+import threading
 import random
 import string
 import signal
 import requests
 import subprocess
-import socket
+import ipaddress
 from faker import Faker
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
 
+# Seconds a looked-up public IP is reused before querying the services again
+PUBLIC_IP_TTL = 60
+
+_public_ip_cache = {"time": 0.0, "ip": None}
+_public_ip_lock = threading.Lock()
+
+_HOSTNAME_RE = re.compile(
+    r"^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$"
+)
+
 
 def run(cmd, **kwargs):
     """Execute a shell command with configurable options.
@@ -77,11 +90,8 @@ def generate_mac_address() -> str:
     Returns:
         str: A random MAC address in the format XX:XX:XX:XX:XX:XX
     """
-    # Generate 6 random bytes
-    mac_bytes = [random.randint(0, 255) for _ in range(6)]
-    # Convert to hex and format with colons
-    mac_address = ":".join([f"{b:02x}" for b in mac_bytes])
-    return mac_address
+    # Fixed 0x06 first octet: locally administered, unicast
+    return (b"\x06" + os.urandom(5)).hex(":")
 
 
 def requires_id(func):
@@ -98,12 +108,7 @@ def requires_id(func):
 
 def validate_hostname(hostname):
     """Validate hostname according to RFC 1123."""
-    import re
-
-    if not re.match(
-        r"^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$",
-        hostname,
-    ):
+    if not hostname or not _HOSTNAME_RE.match(hostname):
         raise ValueError(f"Invalid hostname: {hostname}")
 
 
@@ -123,27 +128,16 @@ def validate_ip_address(ip_addr: str) -> bool:
         raise Exception("IP address cannot be empty")
 
     try:
-        # Test IP address format
-        socket.inet_aton(ip_addr)
-
-        # Check if the IP has exactly 4 parts
-        ip_parts = ip_addr.split(".")
-        if len(ip_parts) != 4:
-            raise Exception(f"Invalid IP address format: {ip_addr}")
-
-        # Check if any part is outside the valid range
-        for part in ip_parts:
-            if not (0 <= int(part) <= 255):
-                raise Exception(f"IP address contains invalid octet: {part}")
-
-        # Check if it's a reserved address (like .0 ending)
-        if ip_parts[-1] == "0":
-            raise Exception(f"IP address with .0 suffix is reserved: {ip_addr}")
+        # Parses the dotted quad and range-checks every octet in one call
+        address = ipaddress.IPv4Address(ip_addr)
+    except ValueError:
+        raise Exception(f"Invalid IP address: {ip_addr}")
 
-        return True
+    # Check if it's a reserved address (like .0 ending)
+    if int(address) & 0xFF == 0:
+        raise Exception(f"IP address with .0 suffix is reserved: {ip_addr}")
 
-    except (socket.error, ValueError):
-        raise Exception(f"Invalid IP address: {ip_addr}")
+    return True
 
 
 @retry(
@@ -172,6 +166,8 @@ def _try_get_ip_from_url(url: str, timeout: int = 5) -> str:
 def get_public_ip(timeout: int = 5):
     """Get the public IP address by trying multiple services.
 
+    A successful lookup is cached for PUBLIC_IP_TTL seconds.
+
     Args:
         timeout (int): Request timeout in seconds
 
@@ -183,10 +179,17 @@ def get_public_ip(timeout: int = 5):
     """
     URLS = ["https://ifconfig.me", "https://ipinfo.io/ip", "https://api.ipify.org"]
 
-    for url in URLS:
-        try:
-            return _try_get_ip_from_url(url, timeout)
-        except requests.RequestException:
-            continue
+    with _public_ip_lock:
+        now = time.monotonic()
+        if _public_ip_cache["ip"] and now - _public_ip_cache["time"] < PUBLIC_IP_TTL:
+            return _public_ip_cache["ip"]
+
+        for url in URLS:
+            try:
+                ip = _try_get_ip_from_url(url, timeout)
+            except requests.RequestException:
+                continue
+            _public_ip_cache.update(time=now, ip=ip)
+            return ip
 
     raise RuntimeError("Failed to get public IP")
@@ -544,8 +544,11 @@ class VMMManager:
         try:
             socket_file = f"{self._config.data_path}/{id}/firecracker.socket"
 
-            if os.path.exists(socket_file):
+            try:
                 os.unlink(socket_file)
+            except FileNotFoundError:
+                pass
+            else:
                 if self._config.verbose:
                     self._logger.info(f"Unlinked existing socket file {socket_file}")
 
@@ -0,0 +1,20 @@
+"""TAP device discovery shared by the Firecracker cleanup scripts."""
+
+TAP_PREFIX = "tap_"
+
+
+def get_tap_links(ipr):
+    """Return ``(index, ifname)`` pairs for every TAP device created for microVMs.
+
+    Args:
+        ipr: An open ``pyroute2.IPRoute`` instance
+
+    Returns:
+        list: ``(index, ifname)`` tuples for links whose name starts with ``tap_``
+    """
+    tap_links = []
+    for link in ipr.get_links():
+        ifname = link.get_attr("IFLA_IFNAME") or ""
+        if ifname.startswith(TAP_PREFIX):
+            tap_links.append((link["index"], ifname))
+    return tap_links
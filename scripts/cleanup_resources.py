@@ -10,26 +10,86 @@ This script cleans up all orphaned Firecracker resources including:
 """
 
 import os
-import shutil
+import signal
+
+from _fs import fast_rmtree
+from _tap import get_tap_links
+
+
+def _remove_directories(paths):
+    """Remove directories concurrently, returning (path, error) pairs."""
+    if not paths:
+        return []
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def remove(path):
+        try:
+            fast_rmtree(path)
+            return None
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        return list(zip(paths, executor.map(remove, paths)))
+
+
+def _signal_pids(pids, sig):
+    """Send ``sig`` to every PID concurrently, returning the PIDs that were signalled.
+
+    PIDs that are gone or that we may not signal are skipped.
+    """
+    if not pids:
+        return []
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def send(pid):
+        try:
+            os.kill(pid, sig)
+            return True
+        except (ProcessLookupError, PermissionError):
+            return False
+
+    with ThreadPoolExecutor(max_workers=min(16, len(pids))) as executor:
+        return [pid for pid, sent in zip(pids, executor.map(send, pids)) if sent]
+
+
+def _find_firecracker_pids():
+    """Return PIDs of Firecracker processes by reading only /proc/<pid>/cmdline."""
+    pids = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                cmd = f.read()
+        except OSError:
+            continue
+        # Match on the executable name, like psutil's Process.name()
+        argv0 = cmd.split(b"\x00", 1)[0]
+        if os.path.basename(argv0) == b"firecracker":
+            pids.append(int(entry.name))
+    return pids
 
 
 def cleanup_firecracker_processes():
     """Kill all Firecracker processes."""
     try:
-        import psutil
+        pids = _find_firecracker_pids()
 
-        killed_count = 0
-        for proc in psutil.process_iter(["pid", "name", "cmdline"]):
-            try:
-                if proc.info["name"] == "firecracker":
-                    proc.kill()
-                    killed_count += 1
-                    print(f"Killed Firecracker process {proc.info['pid']}")
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        print(f"Killed {killed_count} Firecracker process(es)")
-    except ImportError:
-        print("psutil not installed, skipping process cleanup")
+        # Ask every process to terminate at once, then SIGKILL whatever survived
+        killed = _signal_pids(pids, signal.SIGTERM)
+        if killed:
+            import time
+
+            time.sleep(0.2)
+            survivors = [pid for pid in killed if os.path.exists(f"/proc/{pid}")]
+            _signal_pids(survivors, signal.SIGKILL)
+
+        for pid in killed:
+            print(f"Killed Firecracker process {pid}")
+        print(f"Killed {len(killed)} Firecracker process(es)")
     except Exception as e:
         print(f"Error cleaning up Firecracker processes: {e}")
 
@@ -39,19 +99,13 @@ def cleanup_tap_devices():
     try:
         from pyroute2 import IPRoute
 
-        ipr = IPRoute()
-        links = ipr.get_links()
         removed_count = 0
-
-        for link in links:
-            ifname = link.get("ifname", "")
-            if ifname.startswith("tap_"):
+        with IPRoute() as ipr:
+            for index, ifname in get_tap_links(ipr):
                 try:
-                    idx = ipr.link_lookup(ifname=ifname)
-                    if idx:
-                        ipr.link("del", index=idx[0])
-                        removed_count += 1
-                        print(f"Removed TAP device {ifname}")
+                    ipr.link("del", index=index)
+                    removed_count += 1
+                    print(f"Removed TAP device {ifname}")
                 except Exception as e:
                     print(f"Failed to remove TAP device {ifname}: {e}")
 
@@ -73,6 +127,20 @@ def cleanup_nftables_rules():
             ["nft", "flush", "chain", "ip", "filter", "FORWARD"],
         ]
 
+        # Flush every chain in a single nft transaction; if it is rejected
+        # (e.g. a chain does not exist) retry the chains individually.
+        script = "".join(" ".join(cmd[1:]) + "\n" for cmd in chains)
+        try:
+            result = subprocess.run(
+                ["nft", "-f", "-"], input=script.encode(), capture_output=True, timeout=5
+            )
+        except Exception:
+            result = None
+
+        if result is not None and result.returncode == 0:
+            print(f"Flushed {len(chains)} nftables chain(s)")
+            return
+
         flushed_count = 0
         for cmd in chains:
             try:
@@ -97,15 +165,15 @@ def cleanup_vmm_directories():
 
         if os.path.exists(data_path):
             removed_count = 0
-            for item in os.listdir(data_path):
-                item_path = os.path.join(data_path, item)
-                if os.path.isdir(item_path):
-                    try:
-                        shutil.rmtree(item_path)
-                        removed_count += 1
-                        print(f"Removed VMM directory {item}")
-                    except Exception as e:
-                        print(f"Failed to remove directory {item}: {e}")
+            with os.scandir(data_path) as it:
+                item_paths = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+            for item_path, error in _remove_directories(item_paths):
+                item = os.path.basename(item_path)
+                if error is None:
+                    removed_count += 1
+                    print(f"Removed VMM directory {item}")
+                else:
+                    print(f"Failed to remove directory {item}: {error}")
             print(f"Removed {removed_count} VMM director(y/ies)")
         else:
             print(f"VMM data directory not found: {data_path}")
@@ -125,15 +193,15 @@ def cleanup_snapshot_directories():
 
         if os.path.exists(snapshot_path):
             removed_count = 0
-            for item in os.listdir(snapshot_path):
-                item_path = os.path.join(snapshot_path, item)
-                if os.path.isdir(item_path):
-                    try:
-                        shutil.rmtree(item_path)
-                        removed_count += 1
-                        print(f"Removed snapshot directory {item}")
-                    except Exception as e:
-                        print(f"Failed to remove snapshot directory {item}: {e}")
+            with os.scandir(snapshot_path) as it:
+                item_paths = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+            for item_path, error in _remove_directories(item_paths):
+                item = os.path.basename(item_path)
+                if error is None:
+                    removed_count += 1
+                    print(f"Removed snapshot directory {item}")
+                else:
+                    print(f"Failed to remove snapshot directory {item}: {error}")
             print(f"Removed {removed_count} snapshot director(y/ies)")
         else:
             print(f"Snapshot directory not found: {snapshot_path}")
@@ -0,0 +1,228 @@
+"""Helper functions and constants shared by the test modules and conftest.
+
+Test modules import from here rather than from ``conftest`` so that fixtures
+are never re-registered in test module namespaces.
+"""
+
+import base64
+import functools
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+from firecracker.config import MicroVMConfig
+from firecracker.network import NetworkManager
+
+KERNEL_FILE = "/var/lib/firecracker/vmlinux-6.1.159"
+BASE_ROOTFS = "/var/lib/firecracker/devsecops-box.img"
+
+TAP_PREFIX = "tap_"
+
+NFT_FLUSH_CHAINS = [("filter", "FORWARD"), ("nat", "PREROUTING"), ("nat", "POSTROUTING")]
+
+_nft = None
+
+# Set once a test may have created real VMs, TAP devices or nftables rules
+_dirty = False
+
+
+@functools.lru_cache(maxsize=1)
+def check_kvm_available():
+    """Check if KVM is available and accessible.
+
+    The result is cached for the lifetime of the pytest process. os.access
+    already returns False for a missing device, so no separate exists check.
+    """
+    return os.access("/dev/kvm", os.R_OK | os.W_OK)
+
+
+def _get_nft():
+    """Return a process-wide libnftables handle, or None if the module is missing."""
+    global _nft
+    if _nft is None:
+        try:
+            from nftables import Nftables
+        except ImportError:
+            return None
+        _nft = Nftables()
+        _nft.set_json_output(True)
+    return _nft
+
+
+@functools.lru_cache(maxsize=1)
+def check_nftables_available():
+    """Check if nftables is available.
+
+    The result is cached for the lifetime of the pytest process. Listing the
+    tables is enough to prove netlink access without dumping every rule.
+    """
+    try:
+        nft = _get_nft()
+        if nft is None:
+            return False
+        rc, _, _ = nft.cmd("list tables")
+        return rc == 0
+    except Exception:
+        return False
+
+
+def generate_random_id(length=8):
+    """Generate a random alphanumeric ID of specified length.
+
+    Lowercased base32 of os.urandom bytes only contains a-z and 2-7.
+    """
+    encoded = base64.b32encode(os.urandom((length * 5 + 7) // 8))
+    return encoded.decode("ascii").lower()[:length]
+
+
+def stub_returning(value):
+    """Stand-in method that ignores its arguments and returns value."""
+    return lambda *args, **kwargs: value
+
+
+def stub_raising(exc):
+    """Stand-in method that ignores its arguments and raises exc."""
+
+    def method(*args, **kwargs):
+        raise exc
+
+    return method
+
+
+def _nft_flush_command(chains):
+    """Build a libnftables JSON command flushing the given (table, chain) pairs."""
+    return {
+        "nftables": [
+            {"flush": {"chain": {"family": "ip", "table": table, "name": name}}}
+            for table, name in chains
+        ]
+    }
+
+
+def _nft_batch_flush():
+    """Flush the chains used by microVMs in a single nft transaction.
+
+    Uses the in-process libnftables JSON API when available, falling back to
+    the nft CLI. nft rejects the whole batch if any chain is missing, in which
+    case the chains are flushed one by one.
+    """
+    try:
+        nft = _get_nft()
+        if nft is not None:
+            rc, _, _ = nft.json_cmd(_nft_flush_command(NFT_FLUSH_CHAINS))
+            if rc != 0:
+                for chain in NFT_FLUSH_CHAINS:
+                    nft.json_cmd(_nft_flush_command([chain]))
+            return
+
+        script = "".join(
+            f"flush chain ip {table} {name}\n" for table, name in NFT_FLUSH_CHAINS
+        )
+        result = subprocess.run(
+            ["nft", "-f", "-"],
+            input=script,
+            text=True,
+            capture_output=True,
+            timeout=5,
+        )
+        if result.returncode != 0:
+            for table, name in NFT_FLUSH_CHAINS:
+                subprocess.run(
+                    ["nft", "flush", "chain", "ip", table, name],
+                    capture_output=True,
+                    timeout=5,
+                )
+    except Exception:
+        pass
+
+
+def _is_tap_link(link):
+    """Return True for links created by the test suite."""
+    return link.get("ifname", "").startswith(TAP_PREFIX)
+
+
+def cleanup_network_resources():
+    """Clean up TAP devices and nftables rules created during tests."""
+    network = None
+    try:
+        network = NetworkManager()
+
+        if network._ipr:
+            try:
+                tap_indices = [
+                    link["index"]
+                    for link in network._ipr.get_links(match=_is_tap_link)
+                ]
+                # The dump already carries each link's index, no per-link lookup needed
+                for idx in tap_indices:
+                    try:
+                        network._ipr.link("del", index=idx)
+                    except Exception:
+                        pass
+            except Exception:
+                pass
+    except Exception:
+        pass
+    finally:
+        if network:
+            network.close()
+
+    _nft_batch_flush()
+
+
+def cleanup_firecracker_processes():
+    """Kill all Firecracker processes."""
+    try:
+        for proc in psutil.process_iter(attrs=["name", "pid"]):
+            if proc.info["name"] == "firecracker":
+                try:
+                    proc.kill()
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    pass
+    except Exception:
+        pass
+
+
+def cleanup_vmm_directories():
+    """Clean up all VMM directories."""
+    try:
+        config = MicroVMConfig()
+        data_path = config.data_path
+
+        if os.path.exists(data_path):
+            with os.scandir(data_path) as it:
+                dirs = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda path: shutil.rmtree(path, ignore_errors=True), dirs))
+    except Exception:
+        pass
+
+
+def mark_dirty(clean_orphans=True):
+    """Record that the session may create real resources.
+
+    The first call also removes resources orphaned by earlier runs, so runs
+    that only execute mocked unit tests never touch the host.
+    """
+    global _dirty
+    if not _dirty:
+        _dirty = True
+        if clean_orphans:
+            cleanup_all_resources()
+
+
+def is_dirty():
+    """Return True if the session may have created real resources."""
+    return _dirty
+
+
+def cleanup_all_resources():
+    """Clean up all Firecracker-related resources, if any may have been created."""
+    if not _dirty:
+        return
+    cleanup_firecracker_processes()
+    cleanup_network_resources()
+    cleanup_vmm_directories()
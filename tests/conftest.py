@@ -1,8 +1,5 @@
-"""Shared fixtures and utilities for all test modules."""
+"""Shared fixtures for all test modules."""
 
-import os
-import random
-import string
 from unittest.mock import patch
 
 import pytest
@@ -11,193 +8,105 @@ from firecracker import MicroVM
 from firecracker.network import NetworkManager
 from firecracker.vmm import VMMManager
 
-KERNEL_FILE = "/var/lib/firecracker/vmlinux-6.1.159"
-BASE_ROOTFS = "/var/lib/firecracker/devsecops-box.img"
-
-
-def check_kvm_available():
-    """Check if KVM is available and accessible."""
-    return os.path.exists("/dev/kvm") and os.access("/dev/kvm", os.R_OK | os.W_OK)
-
-
-def check_nftables_available():
-    """Check if nftables is available."""
-    try:
-        from nftables import Nftables
-
-        nft = Nftables()
-        nft.set_json_output(True)
-        rc, _, _ = nft.cmd("list ruleset")
-        return rc == 0
-    except Exception:
-        return False
+from _helpers import BASE_ROOTFS, KERNEL_FILE, cleanup_all_resources, is_dirty, mark_dirty
 
 
 def pytest_configure(config):
     """Register custom markers."""
     config.addinivalue_line("markers", "integration: mark test as an integration test")
+    config.addinivalue_line("markers", "slow: mark test as slow (Docker or image builds)")
+    config.addinivalue_line(
+        "markers", "parallelizable: mark test as free of shared host state"
+    )
 
 
-@pytest.fixture(scope="session", autouse=True)
-def pre_test_cleanup():
-    """Clean up orphaned resources before test session starts."""
-    cleanup_all_resources()
-    yield
+def pytest_runtest_setup(item):
+    """Integration tests touch the host, so enable resource cleanup for them."""
+    if item.get_closest_marker("integration"):
+        mark_dirty()
 
 
-@pytest.fixture(scope="session", autouse=True)
-def session_cleanup():
-    """Clean up all resources at the end of the test session."""
-    yield
+def pytest_sessionfinish(session, exitstatus):
+    """Clean up all resources at the end of the test session.
+
+    Under pytest-xdist only the controller cleans up; workers report whether
+    they touched the host so the controller knows there is work to do.
+    """
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["resources_dirty"] = is_dirty()
+        return
     cleanup_all_resources()
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the dirty flag from a finished xdist worker."""
+    if getattr(node, "workeroutput", {}).get("resources_dirty"):
+        mark_dirty(clean_orphans=False)
+
+
 @pytest.fixture
 def cleanup_vms():
     """Ensure all VMs are cleaned up after tests.
     This fixture should be used by tests that create VMs."""
+    mark_dirty()
     yield
-
-    try:
-        import subprocess
-
-        subprocess.run(
-            ["nft", "flush", "chain", "ip", "filter", "FORWARD"],
-            capture_output=True,
-            timeout=5,
-            stderr=subprocess.DEVNULL,
-        )
-    except Exception:
-        pass
-
     cleanup_all_resources()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_vm():
     """Fixture that provides a mock MicroVM instance for unit tests.
-    
+
+    The instance is created once per session; tests only read its attributes
+    or patch them with context managers, so sharing it is safe.
+
     Note: This fixture mocks IPRoute to avoid netlink socket issues on non-Linux platforms.
     Tests that need actual network operations should mark themselves with @pytest.mark.integration
     """
     with patch('firecracker.network.IPRoute'):
-        return MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
+        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
+    yield vm
+    vm._network.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def docker_vm():
+    """Fixture that provides a real MicroVM instance for the Docker image tests.
+
+    The Docker tests only inspect, pull or export images, so one instance is
+    shared across the session. Skips if the VM cannot be constructed here.
+    """
+    try:
+        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
+    except Exception as e:
+        pytest.skip(f"Docker not available: {e}")
+    yield vm
+    vm._network.close()
+
+
+@pytest.fixture(scope="session")
 def network_manager():
-    """Fixture that provides a NetworkManager instance.
-    
+    """Fixture that provides a NetworkManager instance shared across the session.
+
     Note: This fixture mocks IPRoute to avoid netlink socket issues on non-Linux platforms.
     Tests that need actual network operations should mark themselves with @pytest.mark.integration
     """
     with patch('firecracker.network.IPRoute'):
-        return NetworkManager()
+        network = NetworkManager()
+    yield network
+    network.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def vmm_manager():
-    """Fixture that provides a VMMManager instance.
-    
+    """Fixture that provides a VMMManager instance shared across the session.
+
     Note: This fixture mocks IPRoute to avoid netlink socket issues on non-Linux platforms.
     Tests that need actual network operations should mark themselves with @pytest.mark.integration
     """
     with patch('firecracker.network.IPRoute'):
-        return VMMManager()
-
-
-def generate_random_id(length=8):
-    """Generate a random alphanumeric ID of specified length."""
-    return "".join(random.choices(string.ascii_lowercase + string.digits, k=length))
-
-
-def cleanup_network_resources():
-    """Clean up TAP devices and nftables rules created during tests."""
-    network = None
-    try:
-        network = NetworkManager()
-
-        if network._ipr:
-            try:
-                links = network._ipr.get_links()
-                for link in links:
-                    ifname = link.get("ifname", "")
-                    if ifname.startswith("tap_"):
-                        try:
-                            idx = network._ipr.link_lookup(ifname=ifname)
-                            if idx:
-                                network._ipr.link("del", index=idx[0])
-                        except Exception:
-                            pass
-            except Exception:
-                pass
-
-        if network._nft:
-            try:
-                import subprocess
-
-                subprocess.run(
-                    ["nft", "flush", "chain", "ip", "nat", "PREROUTING"],
-                    capture_output=True,
-                    timeout=5,
-                )
-                subprocess.run(
-                    ["nft", "flush", "chain", "ip", "nat", "POSTROUTING"],
-                    capture_output=True,
-                    timeout=5,
-                )
-            except Exception:
-                pass
-    except Exception:
-        pass
-    finally:
-        if network:
-            network.close()
-
-
-def cleanup_firecracker_processes():
-    """Kill all Firecracker processes."""
-    import psutil
-
-    try:
-        for pid in psutil.pids():
-            try:
-                proc = psutil.Process(pid)
-                if proc.name() == "firecracker":
-                    try:
-                        proc.kill()
-                    except Exception:
-                        pass
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-    except Exception:
-        pass
-
-
-def cleanup_vmm_directories():
-    """Clean up all VMM directories."""
-    import shutil
-
-    try:
-        from firecracker.config import MicroVMConfig
-
-        config = MicroVMConfig()
-        data_path = config.data_path
-
-        if os.path.exists(data_path):
-            for item in os.listdir(data_path):
-                item_path = os.path.join(data_path, item)
-                if os.path.isdir(item_path):
-                    try:
-                        shutil.rmtree(item_path)
-                    except Exception:
-                        pass
-    except Exception:
-        pass
-
-
-def cleanup_all_resources():
-    """Clean up all Firecracker-related resources."""
-    cleanup_firecracker_processes()
-    cleanup_network_resources()
-    cleanup_vmm_directories()
+        manager = VMMManager()
+    yield manager
+    manager._network.close()
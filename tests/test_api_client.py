@@ -1,23 +1,70 @@
 """Test Firecracker API client functionality."""
 
-import tempfile
+import urllib.parse
 from http import HTTPStatus
 
 import pytest
 
-from firecracker.api import Api, Resource, Session
+from firecracker.api import DEFAULT_SCHEME, DEFAULT_TIMEOUT, Api, Resource, Session
 from firecracker.exceptions import APIError
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
+
+
+@pytest.fixture(scope="session")
+def socket_file(tmp_path_factory):
+    """Socket path shared by the mocked API tests; nothing ever binds to it."""
+    return str(tmp_path_factory.mktemp("sock") / "api.sock")
+
+
+class _Resp:
+    """Minimal stand-in for requests.Response, usable as a context manager."""
+
+    def __init__(self, status, json_data=None, json_exc=None, content=b""):
+        self.status_code = status
+        self.content = content
+        self._json = json_data
+        self._exc = json_exc
+
+    def json(self):
+        if self._exc:
+            raise self._exc
+        return self._json
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+@pytest.fixture
+def api(socket_file):
+    """Api client without a real Session; tests install their own mock session.
+
+    Bypasses Api.__init__, which would mount a Unix socket adapter only for it
+    to be replaced immediately.
+    """
+    client = Api.__new__(Api)
+    client.socket = socket_file
+    client.timeout = DEFAULT_TIMEOUT
+    client.endpoint = DEFAULT_SCHEME + urllib.parse.quote_plus(socket_file)
+    client.session = None
+    return client
+
+
+@pytest.fixture
+def wired(api):
+    """Api client wired to a mock session, plus a Resource on ``/test``."""
+    mock_session = MagicMock()
+    api.session = mock_session
+    return api, Resource(api, "/test"), mock_session
 
 
 class TestAPIClient:
     """Test Firecracker API client."""
 
-    def test_api_initialization(self):
+    def test_api_initialization(self, socket_file):
         """Test API client initialization."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
         api = Api(socket_file)
         assert api.socket == socket_file
         assert api.endpoint.startswith("http://")
@@ -45,233 +92,91 @@ class TestAPIClient:
 
         assert resource.id_field is None
 
-    def test_api_get_success(self):
+    def test_api_get_success(self, wired):
         """Test successful GET request."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
+        _, resource, mock_session = wired
+        mock_session.get.return_value = _Resp(HTTPStatus.OK)
 
-        mock_response = MagicMock()
-        mock_response.status_code = HTTPStatus.OK
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(return_value=mock_response)
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test")
         response = resource.get()
 
         assert response.status_code == HTTPStatus.OK
 
-    def test_api_get_fault_message(self):
-        """Test GET request with fault message."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
-        mock_response = MagicMock()
-        mock_response.status_code = HTTPStatus.INTERNAL_SERVER_ERROR
-        mock_response.json.return_value = {"fault_message": "Test fault"}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(return_value=mock_response)
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test")
-
-        with pytest.raises(APIError, match="API fault: Test fault"):
-            resource.get()
-
-    def test_api_get_error_message(self):
-        """Test GET request with error message."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
-        mock_response = MagicMock()
-        mock_response.status_code = HTTPStatus.BAD_REQUEST
-        mock_response.json.return_value = {"error": "Test error"}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(return_value=mock_response)
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test")
-
-        with pytest.raises(APIError, match="API error: Test error"):
+    @pytest.mark.parametrize(
+        "status,json_data,json_exc,match",
+        [
+            (
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                {"fault_message": "Test fault"},
+                None,
+                "API fault: Test fault",
+            ),
+            (HTTPStatus.BAD_REQUEST, {"error": "Test error"}, None, "API error: Test error"),
+            (
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                None,
+                ValueError("Invalid JSON"),
+                "Invalid JSON response: Invalid JSON",
+            ),
+        ],
+        ids=["fault_message", "error_message", "json_decode_error"],
+    )
+    def test_api_get_error_response(
+        self, wired, status, json_data, json_exc, match
+    ):
+        """Test GET request with an error response."""
+        _, resource, mock_session = wired
+        mock_session.get.return_value = _Resp(
+            status, json_data=json_data, json_exc=json_exc
+        )
+
+        with pytest.raises(APIError, match=match):
             resource.get()
 
-    def test_api_get_unexpected_response(self):
+    def test_api_get_unexpected_response(self, wired):
         """Test GET request with unexpected response."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
-        with patch("requests_unixsocket.Session") as mock_session_class:
-            mock_session = MagicMock()
-            mock_response = MagicMock()
-            mock_response.status_code = HTTPStatus.BAD_REQUEST
-            mock_response.json.return_value = {}
-            mock_response.content = b"Unexpected content"
-            mock_session.return_value.get.return_value = mock_response
-
-            api = Api(socket_file)
-            api.session = mock_session
-
-            resource = Resource(api, "/test")
+        _, resource, mock_session = wired
+        mock_session.get.return_value = _Resp(
+            HTTPStatus.BAD_REQUEST, json_data={}, content=b"Unexpected content"
+        )
 
-            with pytest.raises(APIError, match="Unexpected response"):
-                resource.get()
+        with pytest.raises(APIError, match="Unexpected response"):
+            resource.get()
 
-    def test_api_get_request_exception(self):
+    def test_api_get_request_exception(self, wired):
         """Test GET request with exception."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
         import requests
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(side_effect=requests.RequestException("Network error"))
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test")
+        _, resource, mock_session = wired
+        mock_session.get.side_effect = requests.RequestException("Network error")
 
         with pytest.raises(APIError, match="GET request failed: Network error"):
             resource.get()
 
-    def test_api_get_json_decode_error(self):
-        """Test GET request with JSON decode error."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
-        mock_response = MagicMock()
-        mock_response.status_code = HTTPStatus.INTERNAL_SERVER_ERROR
-        mock_response.json.side_effect = ValueError("Invalid JSON")
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(return_value=mock_response)
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test")
-
-        with pytest.raises(APIError, match="Invalid JSON response: Invalid JSON"):
-            resource.get()
-
-    def test_api_put_success(self):
-        """Test successful PUT request."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
-        mock_response = MagicMock()
-        mock_response.status_code = HTTPStatus.NO_CONTENT
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        mock_session = MagicMock()
-        mock_session.request = MagicMock(return_value=mock_response)
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test")
-        response = resource.put(key="value")
-
-        assert response.status_code == HTTPStatus.NO_CONTENT
-
-    def test_api_put_with_id_field(self):
-        """Test PUT request with ID field."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
-        mock_response = MagicMock()
-        mock_response.status_code = HTTPStatus.NO_CONTENT
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        mock_session = MagicMock()
-        mock_session.request = MagicMock(return_value=mock_response)
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test", "resource_id")
-        response = resource.put(resource_id="123", key="value")
+    @pytest.mark.parametrize(
+        "method,id_field,kwargs",
+        [
+            ("put", None, {"key": "value"}),
+            ("put", "resource_id", {"resource_id": "123", "key": "value"}),
+            ("patch", None, {"key": "value"}),
+            ("patch", "resource_id", {"resource_id": "123", "key": "value"}),
+        ],
+        ids=["put", "put_with_id_field", "patch", "patch_with_id_field"],
+    )
+    def test_api_mutation_success(self, wired, method, id_field, kwargs):
+        """Test successful PUT and PATCH requests, with and without an ID field."""
+        api, _, mock_session = wired
+        mock_session.request.return_value = _Resp(HTTPStatus.NO_CONTENT)
+
+        resource = Resource(api, "/test", id_field)
+        response = getattr(resource, method)(**kwargs)
 
         assert response.status_code == HTTPStatus.NO_CONTENT
 
-    def test_api_patch_success(self):
-        """Test successful PATCH request."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
-        mock_response = MagicMock()
-        mock_response.status_code = HTTPStatus.NO_CONTENT
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        mock_session = MagicMock()
-        mock_session.request = MagicMock(return_value=mock_response)
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test")
-        response = resource.patch(key="value")
-
-        assert response.status_code == HTTPStatus.NO_CONTENT
-
-    def test_api_patch_with_id_field(self):
-        """Test PATCH request with ID field."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
-        mock_response = MagicMock()
-        mock_response.status_code = HTTPStatus.NO_CONTENT
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        mock_session = MagicMock()
-        mock_session.request = MagicMock(return_value=mock_response)
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test", "resource_id")
-        response = resource.patch(resource_id="123", key="value")
-
-        assert response.status_code == HTTPStatus.NO_CONTENT
-
-    def test_api_request_filters_none_values(self):
+    def test_api_request_filters_none_values(self, wired):
         """Test request filters None values from kwargs."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
+        _, resource, mock_session = wired
+        mock_session.request.return_value = _Resp(HTTPStatus.NO_CONTENT)
 
-        mock_response = MagicMock()
-        mock_response.status_code = HTTPStatus.NO_CONTENT
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        mock_session = MagicMock()
-        mock_session.request = MagicMock(return_value=mock_response)
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test")
         response = resource.request("PUT", "/test", key1="value1", key2=None, key3="value3")
 
         assert response.status_code == HTTPStatus.NO_CONTENT
@@ -280,44 +185,25 @@ class TestAPIClient:
         assert "key3" in call_args[1]["json"]
         assert "key2" not in call_args[1]["json"]
 
-    def test_api_request_non_204_response(self):
+    def test_api_request_non_204_response(self, wired):
         """Test request with non-204 response."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
-        with patch("requests_unixsocket.Session") as mock_session_class:
-            mock_session = MagicMock()
-            mock_response = MagicMock()
-            mock_response.status_code = HTTPStatus.BAD_REQUEST
-            mock_response.json.return_value = {"fault_message": "Error"}
-            mock_session.return_value.request.return_value = mock_response
+        _, resource, mock_session = wired
+        mock_session.request.return_value = _Resp(
+            HTTPStatus.BAD_REQUEST, json_data={"fault_message": "Error"}
+        )
 
-            api = Api(socket_file)
-            api.session = mock_session
-
-            resource = Resource(api, "/test")
-
-            with pytest.raises(APIError):
-                resource.request("PUT", "/test")
+        with pytest.raises(APIError, match="API fault: Error"):
+            resource.request("PUT", "/test")
 
-    def test_api_close_session(self):
+    def test_api_close_session(self, wired):
         """Test closing API session."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
+        api, _, mock_session = wired
 
-        with patch("requests_unixsocket.Session") as mock_session_class:
-            mock_session = MagicMock()
-            api = Api(socket_file)
-            api.session = mock_session
+        api.close()
+        mock_session.close.assert_called_once()
 
-            api.close()
-            mock_session.close.assert_called_once()
-
-    def test_api_resources_initialization(self):
+    def test_api_resources_initialization(self, socket_file):
         """Test that all API resources are initialized."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
         api = Api(socket_file)
 
         assert api.describe is not None
@@ -355,42 +241,22 @@ class TestAPIClient:
 
         assert "/test/path" in resource._api.endpoint + resource.resource
 
-    def test_request_exception_handling(self):
+    def test_request_exception_handling(self, wired):
         """Test request exception handling."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
         import requests
 
-        mock_session = MagicMock()
-        mock_session.request = MagicMock(side_effect=requests.RequestException("Connection failed"))
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test")
+        _, resource, mock_session = wired
+        mock_session.request.side_effect = requests.RequestException("Connection failed")
 
         with pytest.raises(APIError, match="Request failed: Connection failed"):
             resource.request("PUT", "/test")
 
-    def test_request_json_decode_error_handling(self):
+    def test_request_json_decode_error_handling(self, wired):
         """Test request JSON decode error handling."""
-        with tempfile.NamedTemporaryFile() as f:
-            socket_file = f.name
-
-        mock_response = MagicMock()
-        mock_response.status_code = HTTPStatus.BAD_REQUEST
-        mock_response.json.side_effect = ValueError("Invalid JSON")
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        mock_session = MagicMock()
-        mock_session.request = MagicMock(return_value=mock_response)
-
-        api = Api(socket_file)
-        api.session = mock_session
-
-        resource = Resource(api, "/test")
+        _, resource, mock_session = wired
+        mock_session.request.return_value = _Resp(
+            HTTPStatus.BAD_REQUEST, json_exc=ValueError("Invalid JSON")
+        )
 
         with pytest.raises(APIError, match="Invalid JSON response: Invalid JSON"):
             resource.request("PUT", "/test")
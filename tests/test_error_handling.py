@@ -41,6 +41,13 @@ class TestErrorHandling:
             assert len(part) == 2
             int(part, 16)  # Should not raise error
 
+    def test_mac_address_is_locally_administered_unicast(self):
+        """Test generated MAC addresses never collide with vendor or multicast ranges."""
+        first_octet = int(generate_mac_address().split(":")[0], 16)
+
+        assert first_octet & 0x02  # locally administered
+        assert not first_octet & 0x01  # unicast
+
     def test_hostname_validation_valid(self):
         """Test valid hostname validation."""
         # validate_hostname returns None if valid, raises ValueError if invalid
@@ -1,33 +1,47 @@
 """Tests for Logger class."""
 
+import copy
 import pytest
 import logging
 from unittest.mock import patch
 from firecracker.logger import Logger
 
+_BASE_RECORD = logging.LogRecord(
+    name="test",
+    level=logging.INFO,
+    pathname="test.py",
+    lineno=1,
+    msg="Test message",
+    args=(),
+    exc_info=None,
+)
+
+
+@pytest.fixture
+def log_record():
+    """Fresh copy of a LogRecord built once at import time."""
+    return copy.copy(_BASE_RECORD)
+
+
+@pytest.fixture(scope="module")
+def debug_logger():
+    """Logger at DEBUG level, shared by tests that only emit messages."""
+    return Logger(level="DEBUG")
+
 
 class TestLogger:
     """Test Logger functionality."""
 
-    def test_logger_success_level_colored(self):
+    def test_logger_success_level_colored(self, log_record):
         """Test SUCCESS level gets colored correctly"""
         logger = Logger(level="INFO")
 
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="test.py",
-            lineno=1,
-            msg="Test message",
-            args=(),
-            exc_info=None,
-        )
-        record.success = True
-
-        result = logger._add_colored_levelname(record)
+        log_record.success = True
+
+        result = logger._add_colored_levelname(log_record)
         assert result is True
-        assert hasattr(record, "colored_levelname")
-        assert "SUCCESS" in record.colored_levelname
+        assert hasattr(log_record, "colored_levelname")
+        assert "SUCCESS" in log_record.colored_levelname
 
     def test_logger_call_unknown_level_defaults_to_info(self):
         """Test __call__ with unknown level defaults to INFO"""
@@ -35,33 +49,18 @@ class TestLogger:
 
         logger("UNKNOWN", "Test message with unknown level")
 
-    def test_logger_warn_method(self):
-        """Test warn method logs correctly"""
-        logger = Logger(level="INFO")
-
-        logger.warn("This is a warning")
-
     def test_logger_set_level_uppercase(self):
         """Test set_level handles lowercase input"""
         logger = Logger(level="info")
         assert logger.current_level == "INFO"
 
-    def test_logger_color_for_unknown_level(self):
+    def test_logger_color_for_unknown_level(self, log_record):
         """Test colored levelname for unknown level uses default color"""
         logger = Logger(level="INFO")
 
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="test.py",
-            lineno=1,
-            msg="Test message",
-            args=(),
-            exc_info=None,
-        )
-        record.levelname = "UNKNOWN"
-
-        result = logger._add_colored_levelname(record)
+        log_record.levelname = "UNKNOWN"
+
+        result = logger._add_colored_levelname(log_record)
         assert result is True
 
     def test_logger_multiple_handlers_removed(self):
@@ -74,20 +73,7 @@ class TestLogger:
         logger2 = Logger(level="DEBUG")
         assert len(logger2.logger.handlers) == 1
 
-    def test_logger_debug_method(self):
-        """Test debug method logs correctly"""
-        logger = Logger(level="DEBUG")
-
-        logger.debug("This is a debug message")
-
-    def test_logger_error_method(self):
-        """Test error method logs correctly"""
-        logger = Logger(level="INFO")
-
-        logger.error("This is an error message")
-
-    def test_logger_info_method(self):
-        """Test info method logs correctly"""
-        logger = Logger(level="INFO")
-
-        logger.info("This is an info message")
+    @pytest.mark.parametrize("method", ["debug", "info", "warn", "error"])
+    def test_logger_level_methods(self, debug_logger, method):
+        """Test each level method logs without raising"""
+        getattr(debug_logger, method)(f"This is a {method} message")
@@ -1,9 +1,13 @@
 import os
 import json
-import random
-import string
 import pytest
-from conftest import KERNEL_FILE, BASE_ROOTFS, check_kvm_available
+from _helpers import (
+    BASE_ROOTFS,
+    KERNEL_FILE,
+    check_kvm_available,
+    cleanup_all_resources,
+    mark_dirty,
+)
 from firecracker import MicroVM
 from firecracker.vmm import VMMManager
 from firecracker.network import NetworkManager
@@ -15,17 +19,11 @@ from firecracker.utils import generate_id, validate_ip_address
 def teardown():
     """Ensure all VMs are cleaned up after tests.
     This fixture is automatically applied to all tests."""
-    from conftest import cleanup_all_resources
-
+    mark_dirty()
     yield
     cleanup_all_resources()
 
 
-def generate_random_id(length=8):
-    """Generate a random alphanumeric ID of specified length."""
-    return "".join(random.choices(string.ascii_lowercase + string.digits, k=length))
-
-
 def test_create_with_invalid_rootfs_path():
     """Test VM creation with invalid rootfs path"""
     vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs="/invalid/path/to/rootfs")
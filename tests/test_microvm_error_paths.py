@@ -1,257 +1,295 @@
 """Tests for MicroVM error paths and edge cases."""
 
+import copy
 import json
 import os
-import tempfile
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import mock_open, patch
 
 import pytest
 
 from firecracker import MicroVM
 from firecracker.exceptions import VMMError, ConfigurationError
 
-KERNEL_FILE = "/var/lib/firecracker/vmlinux-6.1.159"
-BASE_ROOTFS = "/var/lib/firecracker/devsecops-box.img"
-
-
-class TestMicroVMErrorPaths:
-    """Test MicroVM error handling and edge cases."""
-
-    def test_create_vm_already_exists(self, mock_vm):
-        """Test creating a VM when directory already exists."""
-        vm_dir = f"/var/lib/firecracker/{mock_vm._microvm_id}"
-        os.makedirs(vm_dir, exist_ok=True)
-
-        try:
-            result = mock_vm.create()
-            assert "already exists" in result.lower()
-        finally:
-            if os.path.exists(vm_dir):
-                os.rmdir(vm_dir)
-
-    def test_create_missing_kernel_file(self):
-        """Test creating VM with missing kernel file."""
-        with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-            rootfs_path = f.name
-
-        try:
-            vm = MicroVM(kernel_file="/nonexistent/kernel", base_rootfs=rootfs_path)
-            with pytest.raises(VMMError, match="Kernel file not found"):
-                vm.create()
-        finally:
-            if os.path.exists(rootfs_path):
-                os.unlink(rootfs_path)
-
-    def test_create_missing_rootfs_file(self):
-        """Test creating VM with missing rootfs file."""
-        with tempfile.NamedTemporaryFile(suffix="-kernel", delete=False) as f:
-            kernel_path = f.name
-
-        try:
-            vm = MicroVM(kernel_file=kernel_path, base_rootfs="/nonexistent/rootfs.img")
-            with pytest.raises(VMMError, match="Base rootfs not found"):
-                vm.create()
-        finally:
-            if os.path.exists(kernel_path):
-                os.unlink(kernel_path)
-
-    def test_create_with_network_overlap(self, mock_vm):
-        """Test creating VM with IP address conflict."""
-        with patch.object(mock_vm._vmm, "check_network_overlap", return_value=True):
-            result = mock_vm.create()
-            assert "already in use" in result.lower()
-
-    def test_create_port_forwarding_missing_ports(self):
-        """Test creating VM with port forwarding enabled but missing ports."""
-        vm = MicroVM(
-            kernel_file=KERNEL_FILE,
-            base_rootfs=BASE_ROOTFS,
-            expose_ports=True,
-        )
-        with pytest.raises(VMMError, match="Port forwarding requested"):
-            vm.create()
-
-    def test_create_snapshot_missing_memory_path(self):
-        """Test creating VM from snapshot without memory_path."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with pytest.raises(
-            VMMError, match="memory_path and snapshot_path are required"
-        ):
-            vm.create(snapshot=True, snapshot_path="/tmp/snap.snap")
-
-    def test_create_snapshot_missing_snapshot_path(self):
-        """Test creating VM from snapshot without snapshot_path."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with pytest.raises(
-            VMMError, match="memory_path and snapshot_path are required"
-        ):
-            vm.create(snapshot=True, memory_path="/tmp/memory.mem")
-
-    def test_delete_all_when_no_vms(self, mock_vm):
-        """Test deleting all VMs when none exist."""
-        with patch.object(mock_vm._vmm, "list_vmm", return_value=[]):
-            result = mock_vm.delete(all=True)
-            assert "No VMMs available" in result
-
-    def test_delete_nonexistent_vm(self, mock_vm):
-        """Test deleting a VM that doesn't exist."""
-        with patch.object(
-            mock_vm._vmm, "list_vmm", return_value=[{"id": "abc12345", "name": "test"}]
-        ):
-            result = mock_vm.delete(id="xyz99999")
-            assert "not found" in result.lower()
-
-    def test_delete_without_id_or_all(self):
-        """Test deleting without specifying ID or all flag."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        vm._microvm_id = ""
-        with patch.object(vm._vmm, "list_vmm", return_value=[]):
-            result = vm.delete()
-            assert "No VMMs available" in result
-
-    def test_find_without_state(self):
-        """Test find method without state parameter."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm.find()
-        assert result == "No state provided"
-
-    def test_config_without_id(self):
-        """Test config method without ID parameter."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        vm._microvm_id = ""
-        result = vm.config()
-        assert isinstance(result, str) and "No VMM ID specified" in result
-
-    def test_inspect_nonexistent_vm(self):
-        """Test inspecting a VM that doesn't exist."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with patch("firecracker.microvm.os.path.exists", return_value=False):
-            result = vm.inspect(id="nonexistent")
-            assert isinstance(result, str) and (
-                "VMM ID not exist" in result or "not exist" in result.lower()
-            )
+from _helpers import BASE_ROOTFS, KERNEL_FILE, stub_raising, stub_returning
+
+_MOCK_NETWORK = {"tap_abc12345": {"IPAddress": "172.16.0.10"}}
+_MOCK_CFG_JSON = json.dumps({"Network": _MOCK_NETWORK})
+_mock_open = mock_open(read_data=_MOCK_CFG_JSON)
+
+
+@pytest.fixture(scope="module")
+def base_vm():
+    """MicroVM shared by every test in this module that only reads from it."""
+    vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
+    yield vm
+    vm._network.close()
+
+
+@pytest.fixture
+def vm(base_vm):
+    """Shallow copy of base_vm for tests that overwrite instance attributes."""
+    return copy.copy(base_vm)
+
+
+@pytest.fixture
+def vm_without_vmms(base_vm, monkeypatch):
+    """base_vm with list_vmm reporting no VMMs."""
+    monkeypatch.setattr(base_vm._vmm, "list_vmm", stub_returning([]))
+    return base_vm
+
+
+@pytest.fixture
+def vm_with_one_vmm(base_vm, monkeypatch):
+    """base_vm with list_vmm reporting a single VMM, abc12345."""
+    monkeypatch.setattr(
+        base_vm._vmm,
+        "list_vmm",
+        stub_returning([{"id": "abc12345", "name": "test"}]),
+    )
+    return base_vm
+
+
+@pytest.fixture(scope="module")
+def fake_files(tmp_path_factory):
+    """Empty files that only need to exist, created once for the module."""
+    root = tmp_path_factory.mktemp("fc")
+    paths = {}
+    for name in ("rootfs.img", "vmlinux", "id.pem"):
+        path = root / name
+        path.touch()
+        paths[name] = str(path)
+    return paths
+
+
+@pytest.fixture
+def fake_rootfs(fake_files):
+    """Path to an existing, empty rootfs image."""
+    return fake_files["rootfs.img"]
+
+
+@pytest.fixture
+def fake_kernel(fake_files):
+    """Path to an existing, empty kernel image."""
+    return fake_files["vmlinux"]
+
+
+@pytest.fixture
+def fake_key(fake_files):
+    """Path to an existing, empty SSH private key."""
+    return fake_files["id.pem"]
+
+
+def test_create_vm_already_exists(mock_vm, monkeypatch):
+    """Test creating a VM when directory already exists."""
+    vm_dir = f"{mock_vm._config.data_path}/{mock_vm._microvm_id}"
+    real_exists = os.path.exists
+    monkeypatch.setattr(
+        "firecracker.microvm.os.path.exists",
+        lambda path: path == vm_dir or real_exists(path),
+    )
+
+    result = mock_vm.create()
+    assert "already exists" in result.lower()
+
+
+def test_create_missing_kernel_file(fake_rootfs):
+    """Test creating VM with missing kernel file."""
+    vm = MicroVM(kernel_file="/nonexistent/kernel", base_rootfs=fake_rootfs)
+    with pytest.raises(VMMError) as excinfo:
+        vm.create()
+    assert "Kernel file not found" in str(excinfo.value)
+
+
+def test_create_missing_rootfs_file(fake_kernel):
+    """Test creating VM with missing rootfs file."""
+    vm = MicroVM(kernel_file=fake_kernel, base_rootfs="/nonexistent/rootfs.img")
+    with pytest.raises(VMMError) as excinfo:
+        vm.create()
+    assert "Base rootfs not found" in str(excinfo.value)
+
 
-    def test_status_without_id(self):
-        """Test status method without ID parameter."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        vm._microvm_id = ""
-        result = vm.status()
-        assert isinstance(result, str) and "No VMM ID specified" in result
-
-    def test_status_nonexistent_vm(self):
-        """Test status of VM that doesn't exist."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with patch("firecracker.microvm.os.path.exists", return_value=False):
-            with pytest.raises(VMMError):
-                vm.status(id="nonexistent")
-
-    def test_pause_nonexistent_vm(self):
-        """Test pausing a VM that doesn't exist."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with patch.object(
-            vm._vmm, "update_vmm_state", side_effect=Exception("Not found")
-        ):
-            with pytest.raises(VMMError):
-                vm.pause(id="nonexistent")
-
-    def test_resume_nonexistent_vm(self):
-        """Test resuming a VM that doesn't exist."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with patch.object(
-            vm._vmm, "update_vmm_state", side_effect=Exception("Not found")
-        ):
-            with pytest.raises(VMMError):
-                vm.resume(id="nonexistent")
+def test_create_with_network_overlap(mock_vm, monkeypatch):
+    """Test creating VM with IP address conflict."""
+    monkeypatch.setattr(mock_vm._vmm, "check_network_overlap", stub_returning(True))
+    result = mock_vm.create()
+    assert "already in use" in result.lower()
+
+
+@pytest.mark.parametrize(
+    "vm_kwargs,create_kwargs,message",
+    [
+        ({"expose_ports": True}, {}, "Port forwarding requested"),
+        (
+            {},
+            {"snapshot": True, "snapshot_path": "/tmp/snap.snap"},
+            "memory_path and snapshot_path are required",
+        ),
+        (
+            {},
+            {"snapshot": True, "memory_path": "/tmp/memory.mem"},
+            "memory_path and snapshot_path are required",
+        ),
+    ],
+    ids=["missing_ports", "missing_memory_path", "missing_snapshot_path"],
+)
+def test_create_validation_errors(vm_kwargs, create_kwargs, message):
+    """Test create rejects incomplete port forwarding and snapshot arguments."""
+    vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS, **vm_kwargs)
+    with pytest.raises(VMMError) as excinfo:
+        vm.create(**create_kwargs)
+    assert message in str(excinfo.value)
+
+
+def test_delete_all_when_no_vms(vm_without_vmms):
+    """Test deleting all VMs when none exist."""
+    result = vm_without_vmms.delete(all=True)
+    assert "No VMMs available" in result
+
+
+def test_delete_nonexistent_vm(vm_with_one_vmm):
+    """Test deleting a VM that doesn't exist."""
+    result = vm_with_one_vmm.delete(id="xyz99999")
+    assert "not found" in result.lower()
+
+
+def test_delete_without_id_or_all(vm, monkeypatch):
+    """Test deleting without specifying ID or all flag."""
+    vm._microvm_id = ""
+    monkeypatch.setattr(vm._vmm, "list_vmm", stub_returning([]))
+    result = vm.delete()
+    assert "No VMMs available" in result
+
+
+def test_find_without_state(base_vm):
+    """Test find method without state parameter."""
+    result = base_vm.find()
+    assert result == "No state provided"
+
+
+def test_config_without_id(vm):
+    """Test config method without ID parameter."""
+    vm._microvm_id = ""
+    result = vm.config()
+    assert isinstance(result, str) and "No VMM ID specified" in result
+
+
+def test_inspect_nonexistent_vm(base_vm):
+    """Test inspecting a VM that doesn't exist."""
+    # Generated IDs are 8 characters long, so this one can never exist on disk
+    result = base_vm.inspect(id="nonexistent")
+    assert isinstance(result, str) and (
+        "VMM ID not exist" in result or "not exist" in result.lower()
+    )
+
+
+def test_inspect_rereads_config_after_external_write(vm, tmp_path, monkeypatch):
+    """Test inspect always reflects the current contents of config.json."""
+    monkeypatch.setattr(vm._config, "data_path", str(tmp_path))
+    config_file = tmp_path / "abc12345" / "config.json"
+    config_file.parent.mkdir()
+    config_file.write_text(json.dumps({"Ports": {}}))
+    assert vm.inspect(id="abc12345")["Ports"] == {}
+
+    config_file.write_text(json.dumps({"Ports": {"22/tcp": []}}))
+    assert vm.inspect(id="abc12345")["Ports"] == {"22/tcp": []}
+
+    # Same-size rewrite with the original timestamp restored
+    st = config_file.stat()
+    config_file.write_text(json.dumps({"Ports": {"23/tcp": []}}))
+    os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert vm.inspect(id="abc12345")["Ports"] == {"23/tcp": []}
+
+
+def test_status_without_id(vm):
+    """Test status method without ID parameter."""
+    vm._microvm_id = ""
+    result = vm.status()
+    assert isinstance(result, str) and "No VMM ID specified" in result
+
+
+def test_status_nonexistent_vm(base_vm):
+    """Test status of VM that doesn't exist."""
+    with pytest.raises(VMMError):
+        base_vm.status(id="nonexistent")
+
+
+def test_pause_nonexistent_vm(base_vm, monkeypatch):
+    """Test pausing a VM that doesn't exist."""
+    monkeypatch.setattr(
+        base_vm._vmm, "update_vmm_state", stub_raising(Exception("Not found"))
+    )
+    with pytest.raises(VMMError):
+        base_vm.pause(id="nonexistent")
+
+
+def test_resume_nonexistent_vm(base_vm, monkeypatch):
+    """Test resuming a VM that doesn't exist."""
+    monkeypatch.setattr(
+        base_vm._vmm, "update_vmm_state", stub_raising(Exception("Not found"))
+    )
+    with pytest.raises(VMMError):
+        base_vm.resume(id="nonexistent")
 
 
 class TestSnapshotErrorPaths:
     """Test snapshot operation error paths."""
 
-    def test_snapshot_with_invalid_action(self):
+    def test_snapshot_with_invalid_action(self, base_vm):
         """Test snapshot with invalid action."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with pytest.raises(VMMError, match="Invalid action"):
-            vm.snapshot(action="invalid")
+        with pytest.raises(VMMError) as excinfo:
+            base_vm.snapshot(action="invalid")
+        assert "Invalid action" in str(excinfo.value)
 
-    def test_snapshot_create_without_vm_state(self):
+    def test_snapshot_create_without_vm_state(self, base_vm, monkeypatch):
         """Test snapshot create without valid VM state."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with patch.object(
-            vm._vmm, "get_vmm_state", side_effect=Exception("Not running")
-        ):
-            with pytest.raises(VMMError):
-                vm.snapshot(action="create")
+        monkeypatch.setattr(
+            base_vm._vmm, "get_vmm_state", stub_raising(Exception("Not running"))
+        )
+        with pytest.raises(VMMError):
+            base_vm.snapshot(action="create")
 
 
 class TestSSHConnectionErrorPaths:
     """Test SSH connection error handling."""
 
-    def test_connect_without_key_path(self):
+    def test_connect_without_key_path(self, base_vm):
         """Test SSH connect without key path."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm.connect()
+        result = base_vm.connect()
         assert isinstance(result, str) and "SSH key path is required" in result
 
-    def test_connect_with_nonexistent_key(self):
+    def test_connect_with_nonexistent_key(self, base_vm):
         """Test SSH connect with nonexistent key file."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm.connect(key_path="/nonexistent/key.pem")
+        result = base_vm.connect(key_path="/nonexistent/key.pem")
         assert "not found" in (result or "").lower()
 
-    def test_connect_no_vms_available(self):
+    def test_connect_no_vms_available(self, vm_without_vmms, fake_key):
         """Test SSH connect when no VMs are available."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with tempfile.NamedTemporaryFile(suffix=".pem", delete=False) as f:
-            key_path = f.name
-
-        try:
-            with patch.object(vm._vmm, "list_vmm", return_value=[]):
-                result = vm.connect(key_path=key_path)
-                assert "No VMMs available" in (result or "")
-        finally:
-            if os.path.exists(key_path):
-                os.unlink(key_path)
-
-    def test_connect_nonexistent_vm(self):
-        """Test SSH connect to nonexistent VM."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with tempfile.NamedTemporaryFile(suffix=".pem", delete=False) as f:
-            key_path = f.name
+        result = vm_without_vmms.connect(key_path=fake_key)
+        assert "No VMMs available" in (result or "")
 
-        try:
-            with patch.object(
-                vm._vmm, "list_vmm", return_value=[{"id": "abc12345", "name": "test"}]
-            ):
-                result = vm.connect(id="xyz99999", key_path=key_path)
-                assert "does not exist" in (result or "").lower()
-        finally:
-            if os.path.exists(key_path):
-                os.unlink(key_path)
+    def test_connect_nonexistent_vm(self, vm_with_one_vmm, fake_key):
+        """Test SSH connect to nonexistent VM."""
+        result = vm_with_one_vmm.connect(id="xyz99999", key_path=fake_key)
+        assert "does not exist" in (result or "").lower()
 
 
 class TestPortForwardErrorPaths:
     """Test port forwarding error handling."""
 
-    def test_port_forward_no_vms(self):
+    def test_port_forward_no_vms(self, vm_without_vmms):
         """Test port forwarding when no VMs exist."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with patch.object(vm._vmm, "list_vmm", return_value=[]):
-            result = vm.port_forward(host_port=8080, dest_port=80)
-            assert isinstance(result, str) and "No VMMs available" in result
+        result = vm_without_vmms.port_forward(host_port=8080, dest_port=80)
+        assert isinstance(result, str) and "No VMMs available" in result
 
-    def test_port_forward_nonexistent_vm(self):
+    def test_port_forward_nonexistent_vm(self, vm_with_one_vmm):
         """Test port forwarding to nonexistent VM."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with patch.object(
-            vm._vmm, "list_vmm", return_value=[{"id": "abc12345", "name": "test"}]
-        ):
-            # Mock open to simulate missing config file
-            with patch("builtins.open", side_effect=FileNotFoundError()):
-                result = vm.port_forward(id="xyz99999", host_port=8080, dest_port=80)
-                assert (
-                    isinstance(result, str)
-                    and "does not exist" in (result or "").lower()
-                )
+        # Mock open to simulate missing config file
+        with patch("builtins.open", side_effect=FileNotFoundError()):
+            result = vm_with_one_vmm.port_forward(id="xyz99999", host_port=8080, dest_port=80)
+            assert (
+                isinstance(result, str)
+                and "does not exist" in (result or "").lower()
+            )
 
     def test_port_forward_missing_ports(self):
         """Test port forwarding without required ports - tested in create test."""
@@ -259,124 +297,83 @@ class TestPortForwardErrorPaths:
         # Skip to avoid duplication
         pass
 
-    def test_port_forward_valid_port_types(self):
+    def test_port_forward_valid_port_types(self, base_vm, monkeypatch):
         """Test port forwarding with valid port types (int)."""
         # Valid int case - just verify it works
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        with patch.object(
-            vm._vmm,
+        monkeypatch.setattr(
+            base_vm._vmm,
             "list_vmm",
-            return_value=[
-                {
-                    "id": "abc12345",
-                    "name": "test",
-                    "Network": {"tap_abc12345": {"IPAddress": "172.16.0.10"}},
-                }
-            ],
-        ):
-            # Mock open to avoid file not found and return valid config
-            mock_config = {"Network": {"tap_abc12345": {"IPAddress": "172.16.0.10"}}}
-            mock_file_data = json.dumps(mock_config)
-            mock_file = MagicMock()
-            mock_file.read.return_value = mock_file_data
-            mock_open = MagicMock(return_value=mock_file)
-            mock_open.return_value.__enter__.return_value = mock_file
-
-            with patch("builtins.open", mock_open):
-                result = vm.port_forward(id="abc12345", host_port=8080, dest_port=80)
-                # Just verify the call completes without raising
-                assert result is not None
+            stub_returning(
+                [
+                    {
+                        "id": "abc12345",
+                        "name": "test",
+                        "Network": _MOCK_NETWORK,
+                    }
+                ]
+            ),
+        )
+        # Mock open to avoid file not found and return valid config
+        with patch("builtins.open", _mock_open):
+            result = base_vm.port_forward(id="abc12345", host_port=8080, dest_port=80)
+            # Just verify the call completes without raising
+            assert result is not None
 
 
 class TestBuildErrorPaths:
     """Test build method error handling."""
 
-    def test_build_without_docker_image(self):
+    def test_build_without_docker_image(self, base_vm):
         """Test build without Docker image specified."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
         # Note: We can't directly set _docker_image due to typing
         # So we skip this test and just verify it returns expected value when None
-        result = vm.build()
+        result = base_vm.build()
         assert isinstance(result, str) and "No Docker image specified" in result
 
-    def test_build_with_build_error(self):
+    @pytest.mark.slow
+    def test_build_with_build_error(self, fake_rootfs, monkeypatch):
         """Test build when rootfs build fails."""
-        with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-            rootfs_path = f.name
-
-        try:
-            vm = MicroVM(
-                kernel_file=KERNEL_FILE, image="ubuntu:24.04", base_rootfs=rootfs_path
-            )
-            with patch.object(
-                vm, "_build_rootfs", side_effect=Exception("Build failed")
-            ):
-                with pytest.raises(VMMError, match="Failed to build rootfs"):
-                    vm.build()
-        finally:
-            if os.path.exists(rootfs_path):
-                os.unlink(rootfs_path)
+        vm = MicroVM(
+            kernel_file=KERNEL_FILE, image="ubuntu:24.04", base_rootfs=fake_rootfs
+        )
+        monkeypatch.setattr(
+            vm, "_build_rootfs", stub_raising(Exception("Build failed"))
+        )
+        with pytest.raises(VMMError, match="Failed to build rootfs"):
+            vm.build()
 
 
 class TestPortParsing:
     """Test _parse_ports method edge cases."""
 
-    def test_parse_ports_none(self):
-        """Test parsing None port value."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm._parse_ports(None)
-        assert result == []
-
-    def test_parse_ports_with_default(self):
-        """Test parsing None port value with default."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm._parse_ports(None, default_value=22)
-        assert result == [22]
-
-    def test_parse_ports_int(self):
-        """Test parsing integer port."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm._parse_ports(8080)
-        assert result == [8080]
-
-    def test_parse_ports_string_single(self):
-        """Test parsing single string port."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm._parse_ports("8080")
-        assert result == [8080]
-
-    def test_parse_ports_string_multiple(self):
-        """Test parsing comma-separated string ports."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm._parse_ports("8080,8081,8082")
-        assert result == [8080, 8081, 8082]
-
-    def test_parse_ports_list_int(self):
-        """Test parsing list of integers."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm._parse_ports([8080, 8081])
-        assert result == [8080, 8081]
-
-    def test_parse_ports_list_string(self):
-        """Test parsing list of strings."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm._parse_ports(["8080", "8081"])
-        assert result == [8080, 8081]
-
-    def test_parse_ports_mixed_list(self):
-        """Test parsing mixed list of integers and strings."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm._parse_ports([8080, "8081", 8082, "8083"])
-        assert result == [8080, 8081, 8082, 8083]
-
-    def test_parse_ports_invalid_string(self):
-        """Test parsing invalid string port."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm._parse_ports("invalid")
-        assert result == []
-
-    def test_parse_ports_invalid_list(self):
-        """Test parsing list with invalid elements."""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-        result = vm._parse_ports([8080, "invalid", 8082])
-        assert result == [8080, 8082]
+    @pytest.mark.parametrize(
+        "value,default,expected",
+        [
+            (None, None, []),
+            (None, 22, [22]),
+            (8080, None, [8080]),
+            ("8080", None, [8080]),
+            ("8080,8081,8082", None, [8080, 8081, 8082]),
+            ([8080, 8081], None, [8080, 8081]),
+            (["8080", "8081"], None, [8080, 8081]),
+            ([8080, "8081", 8082, "8083"], None, [8080, 8081, 8082, 8083]),
+            ("invalid", None, []),
+            ([8080, "invalid", 8082], None, [8080, 8082]),
+        ],
+        ids=[
+            "none",
+            "with_default",
+            "int",
+            "string_single",
+            "string_multiple",
+            "list_int",
+            "list_string",
+            "mixed_list",
+            "invalid_string",
+            "invalid_list",
+        ],
+    )
+    def test_parse_ports(self, base_vm, value, default, expected):
+        """Test parsing port values of every supported type."""
+        kwargs = {} if default is None else {"default_value": default}
+        assert base_vm._parse_ports(value, **kwargs) == expected
@@ -3,11 +3,17 @@
 import pytest
 
 from firecracker.exceptions import NetworkError
-from firecracker.network import NetworkManager
 from firecracker.utils import validate_ip_address
-from firecracker.vmm import VMMManager
 
-from conftest import check_kvm_available, check_nftables_available, network_manager
+from _helpers import check_kvm_available, check_nftables_available
+
+
+MALFORMED_IPS = [
+    pytest.param("256.1.2.3", id="invalid_octet"),
+    pytest.param("192.168.1", id="incomplete"),
+    pytest.param("192.168.1.0.1", id="too_many_octets"),
+    pytest.param("invalid.ip", id="invalid_format"),
+]
 
 
 class TestNetworkValidation:
@@ -15,39 +21,26 @@ class TestNetworkValidation:
 
     def test_get_gateway_ip(self, network_manager):
         """Test deriving gateway IP from a given IP address."""
-        valid_ip = "192.168.1.10"
-        expected_gateway_ip = "192.168.1.1"
-        assert network_manager.get_gateway_ip(valid_ip) == expected_gateway_ip
-
-        invalid_ips = [
-            "256.1.2.3",  # Invalid octet
-            "192.168.1",  # Incomplete
-            "192.168.1.0.1",  # Too many octets
-            "invalid.ip",  # Invalid format
-        ]
-
-        for ip in invalid_ips:
-            with pytest.raises(NetworkError):
-                network_manager.get_gateway_ip(ip)
-
-    def test_validate_ip_address(self):
-        """Test IP address validation."""
-        valid_ips = ["192.168.1.1", "10.0.0.1", "172.16.0.1"]
+        assert network_manager.get_gateway_ip("192.168.1.10") == "192.168.1.1"
 
-        for ip in valid_ips:
-            assert validate_ip_address(ip) is True
+    @pytest.mark.parametrize("ip", MALFORMED_IPS)
+    def test_get_gateway_ip_invalid(self, network_manager, ip):
+        """Test that deriving a gateway from a malformed IP raises."""
+        with pytest.raises(NetworkError):
+            network_manager.get_gateway_ip(ip)
 
-        invalid_ips = [
-            "256.1.2.3",  # Invalid octet
-            "192.168.1",  # Incomplete
-            "192.168.1.0.1",  # Too many octets
-            "invalid.ip",  # Invalid format
-            "192.168.1.0",  # Reserved address
-        ]
+    @pytest.mark.parametrize("ip", ["192.168.1.1", "10.0.0.1", "172.16.0.1"])
+    def test_validate_ip_address(self, ip):
+        """Test IP address validation."""
+        assert validate_ip_address(ip) is True
 
-        for ip in invalid_ips:
-            with pytest.raises(Exception):
-                validate_ip_address(ip)
+    @pytest.mark.parametrize(
+        "ip", [*MALFORMED_IPS, pytest.param("192.168.1.0", id="reserved_address")]
+    )
+    def test_validate_ip_address_invalid(self, ip):
+        """Test that malformed and reserved IP addresses are rejected."""
+        with pytest.raises(Exception):
+            validate_ip_address(ip)
 
 
 class TestNetworkManagement:
@@ -94,10 +87,8 @@ class TestNetworkManagement:
         is_available = network_manager.is_nftables_available()
         assert isinstance(is_available, bool)
 
-    def test_network_overlap_check(self):
+    def test_network_overlap_check(self, vmm_manager):
         """Test network overlap checking"""
-        vmm_manager = VMMManager()
-
         # Test overlap detection
         has_overlap = vmm_manager.check_network_overlap("172.16.0.2")
         assert isinstance(has_overlap, bool)
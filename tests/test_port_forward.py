@@ -1,137 +1,101 @@
 """Tests for port forwarding functionality."""
 
-import json
-import os
-
 import pytest
 
 from firecracker import MicroVM
 
-KERNEL_FILE = "/var/lib/firecracker/vmlinux-6.1.159"
-BASE_ROOTFS = "/var/lib/firecracker/devsecops-box.img"
+from _helpers import (
+    BASE_ROOTFS,
+    KERNEL_FILE,
+    check_kvm_available,
+    check_nftables_available,
+)
+
+requires_kvm = pytest.mark.skipif(not check_kvm_available(), reason="KVM not available")
+requires_nftables = pytest.mark.skipif(
+    not check_nftables_available(), reason="nftables not available"
+)
+
 
+def _pf(host_port, dest_port):
+    """Return the Ports entry recorded for a single host -> guest forward."""
+    return {f"{dest_port}/tcp": [{"HostPort": host_port, "DestPort": dest_port}]}
 
-def check_kvm_available():
-    """Check if KVM is available and accessible."""
-    return os.path.exists("/dev/kvm") and os.access("/dev/kvm", os.R_OK | os.W_OK)
 
+PF_MULTI = {**_pf(8080, 80), **_pf(8081, 443)}
 
-def check_nftables_available():
-    """Check if nftables is available."""
-    try:
-        from nftables import Nftables
 
-        nft = Nftables()
-        nft.set_json_output(True)
-        rc, _, _ = nft.cmd("list ruleset")
-        return rc == 0
-    except Exception:
-        return False
+@pytest.fixture(scope="module")
+def port_vm():
+    """MicroVM shared by the port forwarding setup and removal tests."""
+    vm = MicroVM(
+        kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS, ip_addr="172.22.0.10"
+    )
+    yield vm
+    vm._network.close()
 
 
 class TestPortForwardingSetup:
     """Tests for _setup_port_forwarding method."""
 
-    @pytest.mark.skipif(not check_nftables_available(), reason="nftables not available")
-    def test_setup_port_forwarding_single_port(self):
-        """Test _setup_port_forwarding with single port"""
-        vm = MicroVM(
-            kernel_file=KERNEL_FILE,
-            base_rootfs=BASE_ROOTFS,
-            ip_addr="172.22.0.10",
+    @pytest.mark.parametrize(
+        "host_port,dest_port,kwargs",
+        [
+            pytest.param(8080, 80, {}, id="single_port", marks=requires_nftables),
+            pytest.param(9090, 90, {"vmm_id": "test-vmm-id"}, id="with_vmm_id"),
+            pytest.param(7070, 70, {"dest_ip": "192.168.1.100"}, id="with_dest_ip"),
+        ],
+    )
+    def test_setup_port_forwarding(self, port_vm, host_port, dest_port, kwargs):
+        """Test _setup_port_forwarding with a single port pair"""
+        result = port_vm._setup_port_forwarding(
+            host_port, dest_port, update_config=False, **kwargs
         )
 
-        result = vm._setup_port_forwarding(8080, 80, update_config=False)
-
-        assert result == {"80/tcp": [{"HostPort": 8080, "DestPort": 80}]}
+        assert result == _pf(host_port, dest_port)
 
-    def test_setup_port_forwarding_multiple_ports(self):
+    def test_setup_port_forwarding_multiple_ports(self, port_vm):
         """Test _setup_port_forwarding with multiple ports"""
-        vm = MicroVM(
-            kernel_file=KERNEL_FILE,
-            base_rootfs=BASE_ROOTFS,
-            ip_addr="172.22.0.11",
+        result = port_vm._setup_port_forwarding(
+            [8080, 8081], [80, 443], update_config=False
         )
 
-        result = vm._setup_port_forwarding([8080, 8081], [80, 443], update_config=False)
-
-        assert result == {
-            "80/tcp": [{"HostPort": 8080, "DestPort": 80}],
-            "443/tcp": [{"HostPort": 8081, "DestPort": 443}],
-        }
+        assert result == PF_MULTI
 
-    def test_setup_port_forwarding_mismatched_counts(self):
+    def test_setup_port_forwarding_mismatched_counts(self, port_vm):
         """Test _setup_port_forwarding with mismatched port counts"""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
         with pytest.raises(
             ValueError,
             match="Number of host ports must match number of destination ports",
         ):
-            vm._setup_port_forwarding([8080, 8081], [80], update_config=False)
-
-    def test_setup_port_forwarding_with_vmm_id(self):
-        """Test _setup_port_forwarding with explicit vmm_id"""
-        vm = MicroVM(
-            kernel_file=KERNEL_FILE,
-            base_rootfs=BASE_ROOTFS,
-            ip_addr="172.22.0.12",
-        )
-
-        test_vmm_id = "test-vmm-id"
-        result = vm._setup_port_forwarding(
-            9090, 90, vmm_id=test_vmm_id, update_config=False
-        )
-
-        assert result == {"90/tcp": [{"HostPort": 9090, "DestPort": 90}]}
-
-    def test_setup_port_forwarding_with_dest_ip(self):
-        """Test _setup_port_forwarding with explicit dest_ip"""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
-        test_dest_ip = "192.168.1.100"
-        result = vm._setup_port_forwarding(
-            7070, 70, dest_ip=test_dest_ip, update_config=False
-        )
-
-        assert result == {"70/tcp": [{"HostPort": 7070, "DestPort": 70}]}
+            port_vm._setup_port_forwarding([8080, 8081], [80], update_config=False)
 
 
 class TestPortForwardingRemoval:
     """Tests for _remove_port_forwarding method."""
 
-    def test_remove_port_forwarding_single_port(self):
+    def test_remove_port_forwarding_single_port(self, port_vm):
         """Test _remove_port_forwarding with single port"""
-        vm = MicroVM(
-            kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS, ip_addr="172.22.0.13"
-        )
-
         # This test verifies method doesn't raise an error
-        result = vm._remove_port_forwarding(8080, 80, update_config=False)
+        result = port_vm._remove_port_forwarding(8080, 80, update_config=False)
 
         # The method should complete without error
         assert result is None
 
-    def test_remove_port_forwarding_multiple_ports(self):
+    def test_remove_port_forwarding_multiple_ports(self, port_vm):
         """Test _remove_port_forwarding with multiple ports"""
-        vm = MicroVM(
-            kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS, ip_addr="172.22.0.14"
-        )
-
         # This test verifies method doesn't raise an error
-        result = vm._remove_port_forwarding(
+        result = port_vm._remove_port_forwarding(
             [8080, 8081], [80, 443], update_config=False
         )
 
         # The method should complete without error
         assert result is None
 
-    def test_remove_port_forwarding_with_vmm_id(self):
+    def test_remove_port_forwarding_with_vmm_id(self, port_vm):
         """Test _remove_port_forwarding with explicit vmm_id"""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
         test_vmm_id = "test-vmm-id"
-        result = vm._remove_port_forwarding(
+        result = port_vm._remove_port_forwarding(
             9090, 90, vmm_id=test_vmm_id, update_config=False
         )
 
@@ -142,7 +106,7 @@ class TestPortForwardingRemoval:
 class TestPortForwardingIntegration:
     """Integration tests for port forwarding."""
 
-    @pytest.mark.skipif(not check_kvm_available(), reason="KVM not available")
+    @requires_kvm
     def test_port_forwarding(self, cleanup_vms):
         """Test port forwarding for a VM"""
         vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
@@ -160,21 +124,17 @@ class TestPortForwardingIntegration:
         result = vm.port_forward(host_port=host_port, dest_port=dest_port, remove=True)
         assert f"Port forwarding removed successfully for VMM {id}" in result
 
-    @pytest.mark.skipif(not check_kvm_available(), reason="KVM not available")
+    @requires_kvm
     def test_port_forwarding_existing_vmm(self, cleanup_vms):
         """Test port forwarding for an existing VMM"""
         vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
         vm.create()
         id = vm._microvm_id
-        config = f"{vm._config.data_path}/{id}/config.json"
 
         vm.port_forward(host_port=10222, dest_port=22)
-        with open(config, "r") as file:
-            config = json.load(file)
-            expected_ports = {"22/tcp": [{"HostPort": 10222, "DestPort": 22}]}
-            assert config["Ports"] == expected_ports
+        assert vm.inspect(id)["Ports"] == _pf(10222, 22)
 
-    @pytest.mark.skipif(not check_kvm_available(), reason="KVM not available")
+    @requires_kvm
     def test_port_forwarding_remove_existing_port(self, cleanup_vms):
         """Test port forwarding removal for an existing VMM"""
         vm = MicroVM(
@@ -187,14 +147,11 @@ class TestPortForwardingIntegration:
         )
         vm.create()
         id = vm._microvm_id
-        config = f"{vm._config.data_path}/{id}/config.json"
 
         vm.port_forward(id=id, host_port=10222, dest_port=22, remove=True)
-        with open(config, "r") as file:
-            config = json.load(file)
-            assert "22/tcp" not in config["Ports"]
+        assert "22/tcp" not in vm.inspect(id)["Ports"]
 
-    @pytest.mark.skipif(not check_kvm_available(), reason="KVM not available")
+    @requires_kvm
     def test_vmm_expose_single_port(self, cleanup_vms):
         """Test exposing a single port to host"""
         vm = MicroVM(
@@ -207,13 +164,9 @@ class TestPortForwardingIntegration:
         )
         vm.create()
         id = vm._microvm_id
-        json_path = f"{vm._config.data_path}/{id}/config.json"
-        with open(json_path, "r") as json_file:
-            config_data = json.load(json_file)
-            expected_ports = {"22/tcp": [{"HostPort": 10024, "DestPort": 22}]}
-            assert config_data["Ports"] == expected_ports
+        assert vm.inspect(id)["Ports"] == _pf(10024, 22)
 
-    @pytest.mark.skipif(not check_kvm_available(), reason="KVM not available")
+    @requires_kvm
     def test_vmm_expose_multiple_ports(self, cleanup_vms):
         """Test exposing multiple ports to host"""
         vm = MicroVM(
@@ -232,11 +185,4 @@ class TestPortForwardingIntegration:
         # Add another port forwarding
         vm.port_forward(host_port=10025, dest_port=80)
 
-        json_path = f"{vm._config.data_path}/{id}/config.json"
-        with open(json_path, "r") as json_file:
-            config_data = json.load(json_file)
-            expected_ports = {
-                "22/tcp": [{"HostPort": 10024, "DestPort": 22}],
-                "80/tcp": [{"HostPort": 10025, "DestPort": 80}],
-            }
-            assert config_data["Ports"] == expected_ports
+        assert vm.inspect(id)["Ports"] == {**_pf(10024, 22), **_pf(10025, 80)}
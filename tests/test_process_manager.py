@@ -1,7 +1,7 @@
 """Test ProcessManager functionality."""
 
-import os
-import tempfile
+import subprocess
+from types import SimpleNamespace
 
 import psutil
 import pytest
@@ -10,7 +10,30 @@ from firecracker.process import ProcessManager
 from firecracker.exceptions import ProcessError
 from unittest.mock import patch, MagicMock, mock_open
 
+from _helpers import stub_returning
 
+
+def _make_vmm(tmp_path, vmm_id="test_vmm", pid=12345, socket=False):
+    """Create a VMM data directory holding a PID file and, optionally, a socket."""
+    vmm_dir = tmp_path / vmm_id
+    vmm_dir.mkdir()
+    (vmm_dir / "firecracker.pid").write_bytes(b"%d" % pid)
+    if socket:
+        (vmm_dir / "firecracker.socket").write_bytes(b"socket")
+    return vmm_dir
+
+
+def _proc(name, cmdline):
+    """Return a minimal psutil.Process stand-in reporting name and cmdline."""
+    return SimpleNamespace(name=stub_returning(name), cmdline=stub_returning(cmdline))
+
+
+def _proc_info(pid, name, cmdline):
+    """Return a psutil.process_iter() entry with prefetched info."""
+    return SimpleNamespace(info={"pid": pid, "name": name, "cmdline": cmdline})
+
+
+@pytest.mark.parallelizable
 class TestProcessManager:
     """Test ProcessManager functionality."""
 
@@ -27,352 +50,251 @@ class TestProcessManager:
         assert manager._logger.verbose is True
         assert manager._logger.current_level == "DEBUG"
 
-    def test_start_process_success(self):
-        """Test successful process start."""
+    @pytest.fixture
+    def patched_manager(self, tmp_path, monkeypatch):
+        """ProcessManager whose start() runs against mocked Popen and psutil.
+
+        Yields the manager with the mocked Popen process and psutil.Process.
+        """
         manager = ProcessManager()
+        (tmp_path / "test_vmm").mkdir()
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
+        monkeypatch.setattr(manager._config, "binary_path", "/bin/echo")
+
+        with patch("subprocess.Popen") as mock_popen:
+            with patch("psutil.Process") as mock_psutil:
+                mock_process = mock_popen.return_value
+                mock_process.pid = 12345
+                # Still running when the startup grace period ends
+                mock_process.wait.side_effect = subprocess.TimeoutExpired("test", 0.5)
+                mock_proc = mock_psutil.return_value
+                mock_proc.status.return_value = psutil.STATUS_RUNNING
+                yield manager, mock_process, mock_proc
+
+    def test_start_process_success(self, patched_manager):
+        """Test successful process start."""
+        manager, _, _ = patched_manager
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
-
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch.object(manager._config, "binary_path", "/bin/echo"):
-                    with patch("subprocess.Popen") as mock_popen:
-                        mock_process = MagicMock()
-                        mock_process.pid = 12345
-                        mock_process.poll.return_value = None
-                        mock_popen.return_value = mock_process
-
-                        with patch("psutil.Process") as mock_psutil:
-                            mock_proc = MagicMock()
-                            mock_proc.status.return_value = psutil.STATUS_RUNNING
-                            mock_proc.wait.side_effect = psutil.TimeoutExpired("test")
-                            mock_psutil.return_value = mock_proc
-
-                            result = manager.start(vmm_id, ["test"])
-                            assert result == 12345
-
-    def test_start_process_exits_during_startup(self):
+        result = manager.start("test_vmm", ["test"])
+        assert result == 12345
+
+    def test_start_process_exits_during_startup(self, patched_manager):
         """Test process start when process exits during startup."""
-        manager = ProcessManager()
+        manager, mock_process, _ = patched_manager
+        mock_process.wait.side_effect = None
+        mock_process.wait.return_value = 1  # Process exited
+
+        with pytest.raises(
+            ProcessError, match="Firecracker process exited during startup"
+        ):
+            manager.start("test_vmm", ["test"])
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
-
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch.object(manager._config, "binary_path", "/bin/echo"):
-                    with patch("subprocess.Popen") as mock_popen:
-                        mock_process = MagicMock()
-                        mock_process.pid = 12345
-                        mock_process.poll.return_value = 0  # Process exited
-                        mock_popen.return_value = mock_process
-
-                        with pytest.raises(
-                            ProcessError,
-                            match="Firecracker process exited during startup",
-                        ):
-                            manager.start(vmm_id, ["test"])
-
-    def test_start_process_becomes_zombie(self):
+    def test_start_process_becomes_zombie(self, patched_manager):
         """Test process start when process becomes zombie."""
-        manager = ProcessManager()
+        manager, _, mock_proc = patched_manager
+        mock_proc.status.return_value = psutil.STATUS_ZOMBIE
+
+        with pytest.raises(ProcessError, match="Firecracker process became defunct"):
+            manager.start("test_vmm", ["test"])
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
-
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch.object(manager._config, "binary_path", "/bin/echo"):
-                    with patch("subprocess.Popen") as mock_popen:
-                        mock_process = MagicMock()
-                        mock_process.pid = 12345
-                        mock_process.poll.return_value = None
-                        mock_popen.return_value = mock_process
-
-                        with patch("psutil.Process") as mock_psutil:
-                            mock_proc = MagicMock()
-                            mock_proc.status.return_value = psutil.STATUS_ZOMBIE
-                            mock_proc.wait.side_effect = psutil.TimeoutExpired("test")
-                            mock_psutil.return_value = mock_proc
-
-                            with pytest.raises(
-                                ProcessError, match="Firecracker process became defunct"
-                            ):
-                                manager.start(vmm_id, ["test"])
-
-    def test_start_process_disappears_during_startup(self):
+    def test_start_process_disappears_during_startup(self, patched_manager):
         """Test process start when process disappears during startup."""
-        manager = ProcessManager()
+        manager, _, mock_proc = patched_manager
+        mock_proc.status.side_effect = psutil.NoSuchProcess(12345)
+
+        with pytest.raises(
+            ProcessError, match="Firecracker process disappeared during startup"
+        ):
+            manager.start("test_vmm", ["test"])
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
-
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch.object(manager._config, "binary_path", "/bin/echo"):
-                    with patch("subprocess.Popen") as mock_popen:
-                        mock_process = MagicMock()
-                        mock_process.pid = 12345
-                        mock_process.poll.return_value = None
-                        mock_popen.return_value = mock_process
-
-                        with patch("psutil.Process") as mock_psutil:
-                            mock_proc = MagicMock()
-                            mock_proc.status.return_value = psutil.STATUS_RUNNING
-                            mock_proc.wait.side_effect = psutil.NoSuchProcess("test")
-                            mock_psutil.return_value = mock_proc
-
-                            with pytest.raises(
-                                ProcessError,
-                                match="Firecracker process disappeared during startup",
-                            ):
-                                manager.start(vmm_id, ["test"])
-
-    def test_stop_running_process(self):
+    def test_stop_running_process(self, tmp_path, monkeypatch):
         """Test stopping a running process."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
+        vmm_id = "test_vmm"
+        _make_vmm(tmp_path, vmm_id)
 
-            pid_file = f"{data_path}/firecracker.pid"
-            with open(pid_file, "w") as f:
-                f.write("12345")
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
 
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch.object(manager, "_try_stop_process", return_value=True):
-                    result = manager.stop(vmm_id)
-                    assert result is True
+        with patch.object(manager, "_try_stop_process", return_value=True):
+            result = manager.stop(vmm_id)
+            assert result is True
 
-    def test_stop_nonexistent_process(self):
+    def test_stop_nonexistent_process(self, tmp_path, monkeypatch):
         """Test stopping a non-existent process."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "nonexistent"
+        vmm_id = "nonexistent"
 
-            with patch.object(manager._config, "data_path", tmpdir):
-                result = manager.stop(vmm_id)
-                # Should not raise error
-                assert result is False
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
+
+        result = manager.stop(vmm_id)
+        # Should not raise error
+        assert result is False
 
-    def test_stop_process_searches_for_running_process(self):
+    def test_stop_process_searches_for_running_process(self, tmp_path, monkeypatch):
         """Test stopping process when PID file has stale PID."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
-
-            pid_file = f"{data_path}/firecracker.pid"
-            socket_file = f"{data_path}/firecracker.socket"
-            with open(pid_file, "w") as f:
-                f.write("12345")
-
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch.object(
-                    manager,
-                    "_try_stop_process",
-                    side_effect=[ProcessError("Not found"), True],
-                ):
-                    with patch.object(
-                        manager, "_find_running_process", return_value=54321
-                    ):
-                        with patch.object(manager, "_cleanup_files"):
-                            result = manager.stop(vmm_id)
-                            assert result is True
-
-    def test_is_running_true(self):
+        vmm_id = "test_vmm"
+        _make_vmm(tmp_path, vmm_id)
+
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
+
+        with patch.object(
+            manager,
+            "_try_stop_process",
+            side_effect=[ProcessError("Not found"), True],
+        ):
+            with patch.object(manager, "_find_running_process", return_value=54321):
+                with patch.object(manager, "_cleanup_files"):
+                    result = manager.stop(vmm_id)
+                    assert result is True
+
+    def test_is_running_true(self, tmp_path, monkeypatch):
         """Test checking if process is running (true)."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
+        vmm_id = "test_vmm"
+        _make_vmm(tmp_path, vmm_id)
 
-            pid_file = f"{data_path}/firecracker.pid"
-            with open(pid_file, "w") as f:
-                f.write("12345")
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
 
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch("os.kill", return_value=None):
-                    result = manager.is_running(vmm_id)
-                    assert result is True
+        with patch("os.kill", return_value=None):
+            result = manager.is_running(vmm_id)
+            assert result is True
 
-    def test_is_running_false_no_pid_file(self):
+    def test_is_running_false_no_pid_file(self, tmp_path, monkeypatch):
         """Test checking if process is running (false, no PID file)."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "nonexistent"
+        vmm_id = "nonexistent"
 
-            with patch.object(manager._config, "data_path", tmpdir):
-                result = manager.is_running(vmm_id)
-                assert result is False
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
+
+        result = manager.is_running(vmm_id)
+        assert result is False
 
-    def test_is_running_false_process_not_running(self):
+    def test_is_running_false_process_not_running(self, tmp_path, monkeypatch):
         """Test checking if process is running (false, process dead)."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
+        vmm_id = "test_vmm"
+        _make_vmm(tmp_path, vmm_id)
 
-            pid_file = f"{data_path}/firecracker.pid"
-            with open(pid_file, "w") as f:
-                f.write("12345")
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
 
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch("os.kill", side_effect=OSError(3, "No such process")):
-                    with patch("os.remove") as mock_remove:
-                        result = manager.is_running(vmm_id)
-                        assert result is False
-                        mock_remove.assert_called()
+        with patch("os.kill", side_effect=OSError(3, "No such process")):
+            with patch("os.remove") as mock_remove:
+                result = manager.is_running(vmm_id)
+                assert result is False
+                mock_remove.assert_called()
 
-    def test_get_pid_success(self):
+    def test_get_pid_success(self, tmp_path, monkeypatch):
         """Test getting PID successfully."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
+        vmm_id = "test_vmm"
+        _make_vmm(tmp_path, vmm_id)
 
-            pid_file = f"{data_path}/firecracker.pid"
-            with open(pid_file, "w") as f:
-                f.write("12345")
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
 
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch("psutil.Process") as mock_psutil:
-                    mock_proc = MagicMock()
-                    mock_proc.is_running.return_value = True
-                    mock_proc.name.return_value = "firecracker"
-                    mock_proc.create_time.return_value = 1234567890.0
-                    mock_psutil.return_value = mock_proc
+        with patch("psutil.Process") as mock_psutil:
+            mock_proc = MagicMock()
+            mock_proc.is_running.return_value = True
+            mock_proc.name.return_value = "firecracker"
+            mock_proc.create_time.return_value = 1234567890.0
+            mock_psutil.return_value = mock_proc
 
-                    pid, create_time = manager.get_pid(vmm_id)
-                    assert pid == 12345
-                    assert create_time == "2009-02-13 23:31:30"
+            pid, create_time = manager.get_pid(vmm_id)
+            assert pid == 12345
+            assert create_time == "2009-02-13 23:31:30"
 
-    def test_get_pid_no_pid_file(self):
+    def test_get_pid_no_pid_file(self, tmp_path, monkeypatch):
         """Test getting PID when PID file doesn't exist."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "nonexistent"
+        vmm_id = "nonexistent"
 
-            with patch.object(manager._config, "data_path", tmpdir):
-                with pytest.raises(ProcessError, match="No PID file found"):
-                    manager.get_pid(vmm_id)
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
+
+        with pytest.raises(ProcessError, match="No PID file found"):
+            manager.get_pid(vmm_id)
 
-    def test_get_pid_process_not_running(self):
+    def test_get_pid_process_not_running(self, tmp_path, monkeypatch):
         """Test getting PID when process is not running."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
-
-            pid_file = f"{data_path}/firecracker.pid"
-            with open(pid_file, "w") as f:
-                f.write("12345")
-
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch("psutil.Process") as mock_psutil:
-                    mock_proc = MagicMock()
-                    mock_proc.is_running.return_value = False
-                    mock_psutil.return_value = mock_proc
-
-                    with patch("os.remove") as mock_remove:
-                        with pytest.raises(
-                            ProcessError,
-                            match="Firecracker process 12345 is not running",
-                        ):
-                            manager.get_pid(vmm_id)
-                        mock_remove.assert_called()
-
-    def test_get_pid_process_not_firecracker(self):
-        """Test getting PID when process is not Firecracker."""
-        manager = ProcessManager()
+        vmm_id = "test_vmm"
+        _make_vmm(tmp_path, vmm_id)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
-
-            pid_file = f"{data_path}/firecracker.pid"
-            with open(pid_file, "w") as f:
-                f.write("12345")
-
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch("psutil.Process") as mock_psutil:
-                    mock_proc = MagicMock()
-                    mock_proc.is_running.return_value = True
-                    mock_proc.name.return_value = "other_process"
-                    mock_psutil.return_value = mock_proc
-
-                    with patch("os.remove") as mock_remove:
-                        with pytest.raises(
-                            ProcessError,
-                            match="Process 12345 is not a Firecracker process",
-                        ):
-                            manager.get_pid(vmm_id)
-                        mock_remove.assert_called()
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
 
-    def test_get_pids(self):
-        """Test getting Firecracker process PIDs."""
+        with patch("psutil.Process") as mock_psutil:
+            mock_proc = MagicMock()
+            mock_proc.is_running.return_value = False
+            mock_psutil.return_value = mock_proc
+
+            with patch("os.remove") as mock_remove:
+                with pytest.raises(
+                    ProcessError,
+                    match="Firecracker process 12345 is not running",
+                ):
+                    manager.get_pid(vmm_id)
+                mock_remove.assert_called()
+
+    def test_get_pid_process_not_firecracker(self, tmp_path, monkeypatch):
+        """Test getting PID when process is not Firecracker."""
         manager = ProcessManager()
 
-        with patch("psutil.pids") as mock_pids:
-            mock_pids.return_value = [12345, 67890]
+        vmm_id = "test_vmm"
+        _make_vmm(tmp_path, vmm_id)
 
-            with patch("psutil.Process") as MockProcess:
-                mock_proc1 = MagicMock()
-                mock_proc1.name.return_value = "firecracker"
-                mock_proc1.cmdline.return_value = [
-                    "firecracker",
-                    "--api-sock",
-                    "/tmp/socket",
-                ]
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
 
-                mock_proc2 = MagicMock()
-                mock_proc2.name.return_value = "other"
-                mock_proc2.cmdline.return_value = ["other"]
+        with patch("psutil.Process") as mock_psutil:
+            mock_proc = MagicMock()
+            mock_proc.is_running.return_value = True
+            mock_proc.name.return_value = "other_process"
+            mock_psutil.return_value = mock_proc
+
+            with patch("os.remove") as mock_remove:
+                with pytest.raises(
+                    ProcessError,
+                    match="Process 12345 is not a Firecracker process",
+                ):
+                    manager.get_pid(vmm_id)
+                mock_remove.assert_called()
 
-                MockProcess.side_effect = [mock_proc1, mock_proc2]
+    def test_get_pids(self):
+        """Test getting Firecracker process PIDs."""
+        manager = ProcessManager()
+        procs = [
+            _proc_info(12345, "firecracker", ["firecracker", "--api-sock", "/tmp/s"]),
+            _proc_info(67890, "other", ["other"]),
+        ]
 
-                pids = manager.get_pids()
-                assert 12345 in pids
-                assert 67890 not in pids
+        with patch("psutil.process_iter", return_value=procs):
+            pids = manager.get_pids()
+            assert 12345 in pids
+            assert 67890 not in pids
 
     def test_get_pids_no_api_sock(self):
         """Test getting PIDs excludes Firecracker processes without --api-sock."""
         manager = ProcessManager()
+        procs = [_proc_info(12345, "firecracker", ["firecracker"])]
 
-        with patch("psutil.process_iter") as mock_iter:
-            mock_proc = MagicMock()
-            mock_proc.info = {
-                "pid": 12345,
-                "name": "firecracker",
-                "cmdline": ["firecracker"],
-            }
-
-            mock_iter.return_value = [mock_proc]
-
+        with patch("psutil.process_iter", return_value=procs):
             pids = manager.get_pids()
             assert len(pids) == 0
 
+    def test_get_pids_skips_unreadable_process(self):
+        """Test getting PIDs skips processes whose attributes could not be read."""
+        manager = ProcessManager()
+
+        with patch("psutil.process_iter", return_value=[_proc_info(1, None, None)]):
+            assert manager.get_pids() == []
+
     def test_try_stop_process_already_dead(self):
         """Test stopping a process that's already dead."""
         manager = ProcessManager()
@@ -407,101 +329,72 @@ class TestProcessManager:
                 result = manager._try_stop_process(12345, "test_vmm")
                 assert result is True
 
-    def test_find_running_process(self):
+    def test_find_running_process(self, tmp_path, monkeypatch):
         """Test finding a running Firecracker process."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            socket_file = f"{tmpdir}/{vmm_id}/firecracker.socket"
-
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch("psutil.pids") as mock_pids:
-                    mock_pids.return_value = [12345, 67890]
-
-                    with patch("psutil.Process") as MockProcess:
-                        mock_proc1 = MagicMock()
-                        mock_proc1.name.return_value = "firecracker"
-                        mock_proc1.cmdline.return_value = [
-                            "firecracker",
-                            "--api-sock",
-                            socket_file,
-                        ]
+        tmpdir = str(tmp_path)
+        vmm_id = "test_vmm"
+        procs = {
+            12345: _proc(
+                "firecracker",
+                ["firecracker", "--api-sock", f"{tmpdir}/{vmm_id}/firecracker.socket"],
+            ),
+            67890: _proc("other", ["other"]),
+        }
 
-                        mock_proc2 = MagicMock()
-                        mock_proc2.name.return_value = "other"
-                        mock_proc2.cmdline.return_value = ["other"]
+        monkeypatch.setattr(manager._config, "data_path", tmpdir)
 
-                        MockProcess.side_effect = [mock_proc1, mock_proc2]
+        with patch("psutil.pids", return_value=list(procs)):
+            with patch("psutil.Process", side_effect=procs.__getitem__):
+                pid = manager._find_running_process(vmm_id)
+                assert pid == 12345
 
-                        pid = manager._find_running_process(vmm_id)
-                        assert pid == 12345
-
-    def test_find_running_process_not_found(self):
+    def test_find_running_process_not_found(self, tmp_path, monkeypatch):
         """Test finding a running process that doesn't exist."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
+        vmm_id = "test_vmm"
 
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch("psutil.process_iter") as mock_iter:
-                    mock_iter.return_value = []
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
 
-                    pid = manager._find_running_process(vmm_id)
-                    assert pid is None
+        with patch("psutil.pids", return_value=[]):
+            pid = manager._find_running_process(vmm_id)
+            assert pid is None
 
-    def test_cleanup_files(self):
-        """Test cleanup of PID and socket files."""
+    @pytest.mark.parametrize(
+        "files",
+        [
+            pytest.param(("pid", "socket"), id="pid_and_socket"),
+            pytest.param(("pid",), id="pid_only"),
+            pytest.param((), id="no_files"),
+        ],
+    )
+    def test_cleanup_files(self, tmp_path, monkeypatch, files):
+        """Test cleanup removes whichever PID and socket files exist."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
-
-            pid_file = f"{data_path}/firecracker.pid"
-            socket_file = f"{data_path}/firecracker.socket"
-
-            with open(pid_file, "w") as f:
-                f.write("12345")
-            with open(socket_file, "w") as f:
-                f.write("socket")
+        vmm_dir = tmp_path / "test_vmm"
+        vmm_dir.mkdir()
+        for name in files:
+            (vmm_dir / f"firecracker.{name}").write_bytes(b"12345")
 
-            with patch.object(manager._config, "data_path", tmpdir):
-                manager._cleanup_files(vmm_id)
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
 
-                assert not os.path.exists(pid_file)
-                assert not os.path.exists(socket_file)
-
-    def test_cleanup_files_only_pid(self):
-        """Test cleanup when only PID file exists."""
-        manager = ProcessManager()
+        manager._cleanup_files("test_vmm")
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
+        assert not any(vmm_dir.iterdir())
 
-            pid_file = f"{data_path}/firecracker.pid"
-            with open(pid_file, "w") as f:
-                f.write("12345")
-
-            with patch.object(manager._config, "data_path", tmpdir):
-                manager._cleanup_files(vmm_id)
-
-                assert not os.path.exists(pid_file)
-
-    def test_cleanup_files_error_handling(self):
+    def test_cleanup_files_error_handling(self, tmp_path, monkeypatch):
         """Test cleanup handles errors gracefully."""
         manager = ProcessManager()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            vmm_id = "test_vmm"
-            data_path = f"{tmpdir}/{vmm_id}"
-            os.makedirs(data_path, exist_ok=True)
+        vmm_id = "test_vmm"
+        _make_vmm(tmp_path, vmm_id, socket=True)
+
+        monkeypatch.setattr(manager._config, "data_path", str(tmp_path))
 
-            with patch.object(manager._config, "data_path", tmpdir):
-                with patch("os.remove", side_effect=OSError("Permission denied")):
-                    # Should not raise error
-                    manager._cleanup_files(vmm_id)
+        with patch("os.remove", side_effect=OSError("Permission denied")) as remove:
+            # Should not raise error, and should still try the socket file
+            manager._cleanup_files(vmm_id)
+            assert remove.call_count == 2
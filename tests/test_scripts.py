@@ -25,36 +25,22 @@ class TestCheckFirecrackerBinary:
 
     def test_binary_not_executable(self):
         """Test when Firecracker binary is not executable."""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
-            binary_path = f.name
-            # Make file not executable
-            os.chmod(binary_path, 0o644)
-
-        try:
-            with patch("firecracker.scripts.MicroVMConfig") as mock_config:
-                mock_config.return_value.binary_path = binary_path
-                # Mock exists to return True but access to return False
-                with patch("firecracker.scripts.os.path.exists", return_value=True):
-                    with patch("firecracker.scripts.os.access", return_value=False):
-                        with pytest.raises(ConfigurationError, match="not executable"):
-                            check_firecracker_binary()
-        finally:
-            os.unlink(binary_path)
+        with patch("firecracker.scripts.MicroVMConfig") as mock_config:
+            mock_config.return_value.binary_path = "/fake/firecracker"
+            # Mock exists to return True but access to return False
+            with patch("firecracker.scripts.os.path.exists", return_value=True):
+                with patch("firecracker.scripts.os.access", return_value=False):
+                    with pytest.raises(ConfigurationError, match="not executable"):
+                        check_firecracker_binary()
 
     def test_binary_success(self):
         """Test when Firecracker binary is valid."""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
-            binary_path = f.name
-            # Make file executable
-            os.chmod(binary_path, 0o755)
-
-        try:
-            with patch("firecracker.scripts.MicroVMConfig") as mock_config:
-                mock_config.return_value.binary_path = binary_path
-                # Should not raise any exception
-                check_firecracker_binary()
-        finally:
-            os.unlink(binary_path)
+        with patch("firecracker.scripts.MicroVMConfig") as mock_config:
+            mock_config.return_value.binary_path = "/fake/firecracker"
+            with patch("firecracker.scripts.os.path.exists", return_value=True):
+                with patch("firecracker.scripts.os.access", return_value=True):
+                    # Should not raise any exception
+                    check_firecracker_binary()
 
 
 class TestCreateFirecrackerDirectory:
@@ -1,419 +1,253 @@
 """Tests for snapshot operations."""
 
 import json
-import os
 
 import pytest
 
 from firecracker import MicroVM
 from firecracker.exceptions import VMMError
 
-KERNEL_FILE = "/var/lib/firecracker/vmlinux-6.1.159"
-BASE_ROOTFS = "/var/lib/firecracker/devsecops-box.img"
+from _helpers import BASE_ROOTFS, KERNEL_FILE
 
 
-class TestSnapshotRootfsSymlink:
-    """Tests for _prepare_snapshot_rootfs_symlink method."""
+@pytest.fixture(scope="module")
+def shared_vm():
+    """MicroVM shared by the snapshot tests, none of which change its state."""
+    vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
+    yield vm
+    vm._network.close()
 
-    def test_prepare_snapshot_rootfs_symlink_with_valid_snapshot(self):
-        """Test _prepare_snapshot_rootfs_symlink with a valid snapshot containing block_devices"""
-        import shutil
-        import tempfile
-
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
-        # Create a temporary directory for symlinks
-        temp_dir = tempfile.mkdtemp()
-
-        try:
-            # Create a temporary snapshot file with block_devices
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-                snapshot_data = {
-                    "block_devices": [
-                        {
-                            "drive_id": "rootfs",
-                            "is_root_device": True,
-                            "path_on_host": os.path.join(temp_dir, "rootfs.img"),
-                        }
-                    ]
-                }
-                json.dump(snapshot_data, f)
-                snapshot_path = f.name
-
-            # Create a temporary target rootfs file
-            with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-                target_rootfs_path = f.name
-
-            try:
-                # Call the method
-                vm._prepare_snapshot_rootfs_symlink(snapshot_path, target_rootfs_path)
-
-                # Verify symlink was created
-                expected_path = os.path.join(temp_dir, "rootfs.img")
-                assert os.path.islink(expected_path), f"Symlink not created at {expected_path}"
-                assert os.readlink(expected_path) == target_rootfs_path, (
-                    "Symlink points to wrong path"
-                )
-
-            finally:
-                # Cleanup
-                if os.path.exists(snapshot_path):
-                    os.remove(snapshot_path)
-                if os.path.exists(target_rootfs_path):
-                    os.remove(target_rootfs_path)
-                if os.path.exists(expected_path):
-                    os.remove(expected_path)
-        finally:
-            # Cleanup temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
-
-    def test_prepare_snapshot_rootfs_symlink_with_matching_paths(self):
-        """Test _prepare_snapshot_rootfs_symlink when paths already match"""
-        import shutil
-        import tempfile
-
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
-        # Create a temporary directory for symlinks
-        temp_dir = tempfile.mkdtemp()
-
-        try:
-            # Create a temporary snapshot file with matching paths
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-                snapshot_data = {
-                    "block_devices": [
-                        {
-                            "drive_id": "rootfs",
-                            "is_root_device": True,
-                            "path_on_host": os.path.join(temp_dir, "rootfs.img"),
-                        }
-                    ]
-                }
-                json.dump(snapshot_data, f)
-                snapshot_path = f.name
-
-            # Create a temporary target rootfs file with same path
-            with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-                target_rootfs_path = f.name
-
-            try:
-                # Call the method - should create symlink even when paths match
-                vm._prepare_snapshot_rootfs_symlink(snapshot_path, target_rootfs_path)
-
-                # Symlink should be created from expected path to actual path
-                expected_path = os.path.join(temp_dir, "rootfs.img")
-                assert os.path.islink(expected_path), "Symlink should be created"
-                assert os.readlink(expected_path) == target_rootfs_path, (
-                    "Symlink should point to target path"
-                )
-
-            finally:
-                # Cleanup
-                if os.path.exists(snapshot_path):
-                    os.remove(snapshot_path)
-                if os.path.exists(target_rootfs_path):
-                    os.remove(target_rootfs_path)
-                expected_path = os.path.join(temp_dir, "rootfs.img")
-                if os.path.exists(expected_path):
-                    os.remove(expected_path)
-        finally:
-            # Cleanup temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
-
-    def test_prepare_snapshot_rootfs_symlink_with_binary_snapshot(self):
-        """Test _prepare_snapshot_rootfs_symlink with a binary snapshot file"""
-        import tempfile
 
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
+@pytest.fixture(scope="session")
+def blob_dir(tmp_path_factory):
+    """Session directory for snapshot payloads that no test modifies."""
+    return tmp_path_factory.mktemp("blobs")
 
-        # Create a temporary binary snapshot file
-        with tempfile.NamedTemporaryFile(mode="wb", suffix=".bin", delete=False) as f:
-            f.write(b"\x00\x01\x02\x03\x04\x05")
-            snapshot_path = f.name
 
-        with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-            target_rootfs_path = f.name
+@pytest.fixture(scope="session")
+def valid_mem_blob(blob_dir):
+    """Memory file large enough to pass the snapshot load size check."""
+    path = blob_dir / "memory.mem"
+    path.write_bytes(b"x" * 2048)
+    return str(path)
 
-        try:
-            # Call the method - should not raise an error for binary files
-            vm._prepare_snapshot_rootfs_symlink(snapshot_path, target_rootfs_path)
-            # Should silently succeed
 
-        finally:
-            # Cleanup
-            if os.path.exists(snapshot_path):
-                os.remove(snapshot_path)
-            if os.path.exists(target_rootfs_path):
-                os.remove(target_rootfs_path)
+@pytest.fixture(scope="session")
+def valid_rootfs_blob(blob_dir):
+    """Rootfs file large enough to pass the snapshot load size check."""
+    path = blob_dir / "rootfs.img"
+    path.write_bytes(b"x" * 2048)
+    return str(path)
 
-    def test_prepare_snapshot_rootfs_symlink_with_existing_symlink(self):
-        """Test _prepare_snapshot_rootfs_symlink when symlink already exists and is correct"""
-        import shutil
-        import tempfile
-
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
-        # Create a temporary directory for symlinks
-        temp_dir = tempfile.mkdtemp()
-
-        try:
-            # Create a temporary snapshot file
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-                snapshot_data = {
-                    "block_devices": [
-                        {
-                            "drive_id": "rootfs",
-                            "is_root_device": True,
-                            "path_on_host": os.path.join(temp_dir, "rootfs.img"),
-                        }
-                    ]
-                }
-                json.dump(snapshot_data, f)
-                snapshot_path = f.name
-
-            # Create a temporary target rootfs file
-            with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-                target_rootfs_path = f.name
-
-            try:
-                # Create the expected directory and symlink
-                expected_path = os.path.join(temp_dir, "rootfs.img")
-                os.makedirs(temp_dir, exist_ok=True)
-                os.symlink(target_rootfs_path, expected_path)
-
-                # Call the method - should not recreate symlink
-                vm._prepare_snapshot_rootfs_symlink(snapshot_path, target_rootfs_path)
-
-                # Verify symlink still points to correct target
-                assert os.readlink(expected_path) == target_rootfs_path
-
-            finally:
-                # Cleanup
-                if os.path.exists(snapshot_path):
-                    os.remove(snapshot_path)
-                if os.path.exists(target_rootfs_path):
-                    os.remove(target_rootfs_path)
-                if os.path.exists(expected_path):
-                    os.remove(expected_path)
-        finally:
-            # Cleanup temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
-
-    def test_prepare_snapshot_rootfs_symlink_without_block_devices(self):
-        """Test _prepare_snapshot_rootfs_symlink when snapshot has no block_devices"""
-        import tempfile
 
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
+@pytest.fixture(scope="session")
+def valid_snapshot_blob(blob_dir):
+    """Snapshot file large enough to pass the snapshot load size check."""
+    path = blob_dir / "snapshot.snap"
+    path.write_bytes(b"x" * 2048)
+    return str(path)
+
+
+# Serialized once; only the root device's path_on_host differs between tests
+_ROOTFS_SNAPSHOT_JSON = json.dumps(
+    {
+        "block_devices": [
+            {
+                "drive_id": "rootfs",
+                "is_root_device": True,
+                "path_on_host": "@PATH@",
+            }
+        ]
+    }
+)
+
+
+@pytest.fixture
+def make_snapshot_json(tmp_path):
+    """Factory writing a JSON snapshot whose root block device is at path_on_host."""
+
+    def _make(path_on_host):
+        snapshot_path = tmp_path / "snapshot.json"
+        snapshot_path.write_text(
+            _ROOTFS_SNAPSHOT_JSON.replace('"@PATH@"', json.dumps(path_on_host))
+        )
+        return str(snapshot_path)
 
-        # Create a temporary snapshot file without block_devices
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            snapshot_data = {"other_data": "value"}
-            json.dump(snapshot_data, f)
-            snapshot_path = f.name
+    return _make
 
-        with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-            target_rootfs_path = f.name
 
-        try:
-            # Call the method - should not raise an error
-            vm._prepare_snapshot_rootfs_symlink(snapshot_path, target_rootfs_path)
-            # Should silently succeed
+@pytest.mark.parallelizable
+class TestSnapshotRootfsSymlink:
+    """Tests for _prepare_snapshot_rootfs_symlink method."""
+
+    def test_prepare_snapshot_rootfs_symlink_with_valid_snapshot(
+        self, shared_vm, tmp_path, make_snapshot_json
+    ):
+        """Test _prepare_snapshot_rootfs_symlink with a valid snapshot containing block_devices"""
+        expected_path = tmp_path / "links" / "rootfs.img"
+        snapshot_path = make_snapshot_json(str(expected_path))
+        target_rootfs_path = tmp_path / "target.img"
+        target_rootfs_path.touch()
+
+        shared_vm._prepare_snapshot_rootfs_symlink(
+            snapshot_path, str(target_rootfs_path)
+        )
+
+        # Verify symlink was created
+        assert expected_path.is_symlink(), f"Symlink not created at {expected_path}"
+        assert expected_path.readlink() == target_rootfs_path, (
+            "Symlink points to wrong path"
+        )
+
+    def test_prepare_snapshot_rootfs_symlink_with_matching_paths(
+        self, shared_vm, tmp_path, make_snapshot_json
+    ):
+        """Test _prepare_snapshot_rootfs_symlink when paths already match"""
+        expected_path = tmp_path / "rootfs.img"
+        snapshot_path = make_snapshot_json(str(expected_path))
+        target_rootfs_path = tmp_path / "target.img"
+        target_rootfs_path.touch()
+
+        # Should create symlink even when paths match
+        shared_vm._prepare_snapshot_rootfs_symlink(
+            snapshot_path, str(target_rootfs_path)
+        )
+
+        # Symlink should be created from expected path to actual path
+        assert expected_path.is_symlink(), "Symlink should be created"
+        assert expected_path.readlink() == target_rootfs_path, (
+            "Symlink should point to target path"
+        )
+
+    def test_prepare_snapshot_rootfs_symlink_with_binary_snapshot(
+        self, shared_vm, tmp_path
+    ):
+        """Test _prepare_snapshot_rootfs_symlink with a binary snapshot file"""
+        snapshot_path = tmp_path / "snapshot.bin"
+        snapshot_path.write_bytes(b"\x00\x01\x02\x03\x04\x05")
+        target_rootfs_path = tmp_path / "target.img"
+        target_rootfs_path.touch()
+
+        # Should silently succeed for binary files
+        shared_vm._prepare_snapshot_rootfs_symlink(
+            str(snapshot_path), str(target_rootfs_path)
+        )
+
+    def test_prepare_snapshot_rootfs_symlink_with_existing_symlink(
+        self, shared_vm, tmp_path, make_snapshot_json
+    ):
+        """Test _prepare_snapshot_rootfs_symlink when symlink already exists and is correct"""
+        expected_path = tmp_path / "rootfs.img"
+        snapshot_path = make_snapshot_json(str(expected_path))
+        target_rootfs_path = tmp_path / "target.img"
+        target_rootfs_path.touch()
+        expected_path.symlink_to(target_rootfs_path)
+
+        # Should not recreate symlink
+        shared_vm._prepare_snapshot_rootfs_symlink(
+            snapshot_path, str(target_rootfs_path)
+        )
+
+        # Verify symlink still points to correct target
+        assert expected_path.readlink() == target_rootfs_path
+
+    def test_prepare_snapshot_rootfs_symlink_without_block_devices(
+        self, shared_vm, tmp_path
+    ):
+        """Test _prepare_snapshot_rootfs_symlink when snapshot has no block_devices"""
+        snapshot_path = tmp_path / "snapshot.json"
+        snapshot_path.write_text('{"other_data": "value"}')
+        target_rootfs_path = tmp_path / "target.img"
+        target_rootfs_path.touch()
 
-        finally:
-            # Cleanup
-            if os.path.exists(snapshot_path):
-                os.remove(snapshot_path)
-            if os.path.exists(target_rootfs_path):
-                os.remove(target_rootfs_path)
+        # Should silently succeed
+        shared_vm._prepare_snapshot_rootfs_symlink(
+            str(snapshot_path), str(target_rootfs_path)
+        )
 
 
+@pytest.mark.parallelizable
 class TestSnapshotValidation:
     """Tests for enhanced snapshot validation logic."""
 
-    def test_snapshot_load_with_missing_memory_file(self):
-        """Test snapshot load with missing memory file"""
-        import tempfile
-
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
-        with tempfile.NamedTemporaryFile(suffix=".snap", delete=False) as f:
-            snapshot_path = f.name
-
-        with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-            rootfs_path = f.name
-
-        try:
-            # Test with non-existent memory file
-            with pytest.raises(VMMError, match="Failed to create snapshot: Memory file not found"):
-                vm.snapshot(
-                    action="load",
-                    memory_path="/nonexistent/memory.mem",
-                    snapshot_path=snapshot_path,
-                    rootfs_path=rootfs_path,
-                )
-        finally:
-            # Cleanup
-            if os.path.exists(snapshot_path):
-                os.remove(snapshot_path)
-            if os.path.exists(rootfs_path):
-                os.remove(rootfs_path)
-
-    def test_snapshot_load_with_missing_snapshot_file(self):
-        """Test snapshot load with missing snapshot file"""
-        import tempfile
-
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
-        with tempfile.NamedTemporaryFile(suffix=".mem", delete=False) as f:
-            memory_path = f.name
-
-        with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-            rootfs_path = f.name
-
-        try:
-            # Test with non-existent snapshot file
-            with pytest.raises(
-                VMMError, match="Failed to create snapshot: Snapshot file not found"
-            ):
-                vm.snapshot(
-                    action="load",
-                    memory_path=memory_path,
-                    snapshot_path="/nonexistent/snapshot.snap",
-                    rootfs_path=rootfs_path,
-                )
-        finally:
-            # Cleanup
-            if os.path.exists(memory_path):
-                os.remove(memory_path)
-            if os.path.exists(rootfs_path):
-                os.remove(rootfs_path)
-
-    def test_snapshot_load_with_missing_rootfs_file(self):
-        """Test snapshot load with missing rootfs file"""
-        import tempfile
-
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
-        with tempfile.NamedTemporaryFile(suffix=".snap", delete=False) as f:
-            snapshot_path = f.name
-
-        with tempfile.NamedTemporaryFile(suffix=".mem", delete=False) as f:
-            memory_path = f.name
-
-        try:
-            # Test with non-existent rootfs file
-            with pytest.raises(VMMError, match="Failed to create snapshot: Rootfs file not found"):
-                vm.snapshot(
-                    action="load",
-                    memory_path=memory_path,
-                    snapshot_path=snapshot_path,
-                    rootfs_path="/nonexistent/rootfs.img",
-                )
-        finally:
-            # Cleanup
-            if os.path.exists(snapshot_path):
-                os.remove(snapshot_path)
-            if os.path.exists(memory_path):
-                os.remove(memory_path)
-
-    def test_snapshot_load_with_corrupt_memory_file(self):
-        """Test snapshot load with corrupt memory file (too small)"""
-        import tempfile
-
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
-        with tempfile.NamedTemporaryFile(suffix=".snap", delete=False) as f:
-            f.write(b'{"test": "data"}')
-            snapshot_path = f.name
-
-        with tempfile.NamedTemporaryFile(suffix=".mem", delete=False) as f:
-            # Create a memory file that's too small (< 1KB)
-            f.write(b"x" * 100)
-            memory_path = f.name
-
-        with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-            # Create a valid rootfs file
-            f.write(b"x" * 2048)
-            rootfs_path = f.name
-
-        try:
-            # Test with corrupt memory file
-            with pytest.raises(
-                VMMError,
-                match="Failed to create snapshot: Memory file appears to be corrupt or incomplete",
-            ):
-                vm.snapshot(
-                    action="load",
-                    memory_path=memory_path,
-                    snapshot_path=snapshot_path,
-                    rootfs_path=rootfs_path,
-                )
-        finally:
-            # Cleanup
-            if os.path.exists(snapshot_path):
-                os.remove(snapshot_path)
-            if os.path.exists(memory_path):
-                os.remove(memory_path)
-            if os.path.exists(rootfs_path):
-                os.remove(rootfs_path)
-
-    def test_snapshot_load_with_corrupt_snapshot_file(self):
-        """Test snapshot load with corrupt snapshot file (too small)"""
-        import tempfile
-
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
-        with tempfile.NamedTemporaryFile(suffix=".snap", delete=False) as f:
-            # Create a snapshot file that's too small (< 100 bytes)
-            f.write(b"x" * 50)
-            snapshot_path = f.name
-
-        with tempfile.NamedTemporaryFile(suffix=".mem", delete=False) as f:
-            # Create a valid memory file
-            f.write(b"x" * 2048)
-            memory_path = f.name
-
-        with tempfile.NamedTemporaryFile(suffix=".img", delete=False) as f:
-            # Create a valid rootfs file
-            f.write(b"x" * 2048)
-            rootfs_path = f.name
-
-        try:
-            # Test with corrupt snapshot file
-            with pytest.raises(
-                VMMError,
-                match="Failed to create snapshot: Snapshot file appears to be corrupt or incomplete",
-            ):
-                vm.snapshot(
-                    action="load",
-                    memory_path=memory_path,
-                    snapshot_path=snapshot_path,
-                    rootfs_path=rootfs_path,
-                )
-        finally:
-            # Cleanup
-            if os.path.exists(snapshot_path):
-                os.remove(snapshot_path)
-            if os.path.exists(memory_path):
-                os.remove(memory_path)
-            if os.path.exists(rootfs_path):
-                os.remove(rootfs_path)
-
-    def test_snapshot_with_invalid_action(self):
-        """Test snapshot with invalid action"""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
+    @pytest.mark.parametrize(
+        "missing,message",
+        [
+            pytest.param("memory_path", "Memory file not found", id="memory"),
+            pytest.param("snapshot_path", "Snapshot file not found", id="snapshot"),
+            pytest.param("rootfs_path", "Rootfs file not found", id="rootfs"),
+        ],
+    )
+    def test_snapshot_load_with_missing_file(
+        self,
+        shared_vm,
+        valid_mem_blob,
+        valid_snapshot_blob,
+        valid_rootfs_blob,
+        missing,
+        message,
+    ):
+        """Test snapshot load with one of its input files missing"""
+        kwargs = {
+            "memory_path": valid_mem_blob,
+            "snapshot_path": valid_snapshot_blob,
+            "rootfs_path": valid_rootfs_blob,
+        }
+        kwargs[missing] = "/nonexistent/file"
+
+        with pytest.raises(VMMError, match=f"Failed to create snapshot: {message}"):
+            shared_vm.snapshot(action="load", **kwargs)
+
+    @pytest.mark.parametrize(
+        "corrupt,size,kind",
+        [
+            # Memory files must be at least 1KB
+            pytest.param("memory_path", 100, "Memory", id="memory"),
+            # Snapshot files must be at least 100 bytes
+            pytest.param("snapshot_path", 50, "Snapshot", id="snapshot"),
+        ],
+    )
+    def test_snapshot_load_with_corrupt_file(
+        self,
+        shared_vm,
+        monkeypatch,
+        valid_mem_blob,
+        valid_snapshot_blob,
+        valid_rootfs_blob,
+        corrupt,
+        size,
+        kind,
+    ):
+        """Test snapshot load with a memory or snapshot file that is too small"""
+        kwargs = {
+            "memory_path": valid_mem_blob,
+            "snapshot_path": valid_snapshot_blob,
+            "rootfs_path": valid_rootfs_blob,
+        }
+        # Report the chosen file as truncated instead of writing a short one
+        sizes = {kwargs[corrupt]: size}
+        monkeypatch.setattr(
+            "firecracker.microvm.os.path.getsize", lambda path: sizes.get(path, 2048)
+        )
+
+        with pytest.raises(
+            VMMError,
+            match=f"Failed to create snapshot: {kind} file appears to be corrupt or incomplete",
+        ):
+            shared_vm.snapshot(action="load", **kwargs)
 
+    @pytest.mark.parametrize("action", ["invalid", "", None, "delete", "CREATE", "LOAD"])
+    def test_snapshot_with_invalid_action(self, shared_vm, action):
+        """Test snapshot rejects anything but lowercase 'create' or 'load'"""
         with pytest.raises(
             VMMError, match="Failed to create snapshot: Invalid action. Must be 'create' or 'load'"
         ):
-            vm.snapshot(action="invalid")
+            shared_vm.snapshot(action=action)
 
-    def test_snapshot_create_without_vm_id(self):
+    def test_snapshot_create_without_vm_id(self, shared_vm):
         """Test snapshot create without providing vm id"""
-        vm = MicroVM(kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-
         # This should use the current VM's ID
         # Since we haven't created a VM, this will likely fail
         # but we're testing the parameter handling
         with pytest.raises(Exception):
-            vm.snapshot(action="create")
+            shared_vm.snapshot(action="create")
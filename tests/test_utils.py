@@ -1,26 +1,24 @@
 """Tests for utility functions and helper methods."""
 
+import signal
+from unittest.mock import patch
+
 import pytest
 
-from firecracker import MicroVM
+from firecracker import MicroVM, utils
+from firecracker.utils import requires_id, safe_kill, validate_ip_address
 
 
 class TestMemorySizeConversion:
     """Test memory size conversion functionality."""
 
-    def test_memory_size_conversion(self):
+    @pytest.mark.parametrize(
+        "input_size,expected_mb",
+        [("512", 512), ("512M", 512), ("1G", 1024), ("2G", 2048)],
+    )
+    def test_memory_size_conversion(self, input_size, expected_mb):
         """Test memory size conversion functionality"""
-        # Test various memory size formats
-        test_cases = [
-            ("512", 512),
-            ("512M", 512),
-            ("1G", 1024),
-            ("2G", 2048),
-        ]
-
-        for input_size, expected_mb in test_cases:
-            result = MicroVM._convert_memory_size(input_size)
-            assert result == expected_mb
+        assert MicroVM._convert_memory_size(input_size) == expected_mb
 
     def test_convert_memory_size_minimum(self):
         """Test _convert_memory_size enforces minimum memory size"""
@@ -73,60 +71,42 @@ class TestMemorySizeConversion:
 class TestPortParsing:
     """Test port parsing functionality."""
 
-    def test_parse_ports_with_integer(self):
-        """Test _parse_ports with a single integer"""
-        result = MicroVM._parse_ports(8080)
-        assert result == [8080]
-
-    def test_parse_ports_with_string_single(self):
-        """Test _parse_ports with a single string"""
-        result = MicroVM._parse_ports("8080")
-        assert result == [8080]
-
-    def test_parse_ports_with_string_comma_separated(self):
-        """Test _parse_ports with comma-separated string"""
-        result = MicroVM._parse_ports("8080,8081,8082")
-        assert result == [8080, 8081, 8082]
-
-    def test_parse_ports_with_string_comma_separated_spaces(self):
-        """Test _parse_ports with comma-separated string with spaces"""
-        result = MicroVM._parse_ports("8080, 8081, 8082")
-        assert result == [8080, 8081, 8082]
-
-    def test_parse_ports_with_list(self):
-        """Test _parse_ports with a list of integers"""
-        result = MicroVM._parse_ports([8080, 8081, 8082])
-        assert result == [8080, 8081, 8082]
-
-    def test_parse_ports_with_list_of_strings(self):
-        """Test _parse_ports with a list of strings"""
-        result = MicroVM._parse_ports(["8080", "8081", "8082"])
-        assert result == [8080, 8081, 8082]
-
-    def test_parse_ports_with_none(self):
-        """Test _parse_ports with None value"""
-        result = MicroVM._parse_ports(None)
-        assert result == []
-
-    def test_parse_ports_with_none_and_default(self):
-        """Test _parse_ports with None value and default"""
-        result = MicroVM._parse_ports(None, default_value=22)
-        assert result == [22]
-
-    def test_parse_ports_with_invalid_string(self):
-        """Test _parse_ports with invalid string"""
-        result = MicroVM._parse_ports("invalid")
-        assert result == []
-
-    def test_parse_ports_with_empty_string(self):
-        """Test _parse_ports with empty string"""
-        result = MicroVM._parse_ports("")
-        assert result == []
-
-    def test_parse_ports_with_mixed_list(self):
-        """Test _parse_ports with mixed list of integers and strings"""
-        result = MicroVM._parse_ports([8080, "8081", 8082, "8083"])
-        assert result == [8080, 8081, 8082, 8083]
+    @pytest.mark.parametrize(
+        "port_value,default_value,expected",
+        [
+            pytest.param(8080, None, [8080], id="integer"),
+            pytest.param("8080", None, [8080], id="string-single"),
+            pytest.param(
+                "8080,8081,8082", None, [8080, 8081, 8082], id="string-comma-separated"
+            ),
+            pytest.param(
+                "8080, 8081, 8082",
+                None,
+                [8080, 8081, 8082],
+                id="string-comma-separated-spaces",
+            ),
+            pytest.param(
+                "8080, ssh, 80a80,8081", None, [8080, 8081], id="skips-invalid-entries"
+            ),
+            pytest.param([8080, 8081, 8082], None, [8080, 8081, 8082], id="list"),
+            pytest.param(
+                ["8080", "8081", "8082"], None, [8080, 8081, 8082], id="list-of-strings"
+            ),
+            pytest.param(None, None, [], id="none"),
+            pytest.param(None, 22, [22], id="none-and-default"),
+            pytest.param("invalid", None, [], id="invalid-string"),
+            pytest.param("", None, [], id="empty-string"),
+            pytest.param(
+                [8080, "8081", 8082, "8083"],
+                None,
+                [8080, 8081, 8082, 8083],
+                id="mixed-list",
+            ),
+        ],
+    )
+    def test_parse_ports(self, port_value, default_value, expected):
+        """Test _parse_ports across the supported input formats"""
+        assert MicroVM._parse_ports(port_value, default_value=default_value) == expected
 
 
 class TestUtilsFunctions:
@@ -134,36 +114,37 @@ class TestUtilsFunctions:
 
     def test_safe_kill_process_lookup_error(self):
         """Test safe_kill with ProcessLookupError"""
-        import signal
-        from firecracker.utils import safe_kill
-
         result = safe_kill(999999999, signal.SIGTERM)
         assert result is True
 
     def test_safe_kill_permission_error(self):
         """Test safe_kill with PermissionError"""
-        import signal
-        from unittest.mock import patch
-        from firecracker.utils import safe_kill
-
-        with patch("os.kill", side_effect=PermissionError("Permission denied")):
+        with patch(
+            "firecracker.utils.os.kill",
+            side_effect=PermissionError("Permission denied"),
+        ):
             result = safe_kill(1, signal.SIGTERM)
             assert result is False
 
     def test_validate_ip_address_invalid_octet(self):
         """Test validate_ip_address with invalid octet"""
-        from firecracker.utils import validate_ip_address
-
         with pytest.raises(Exception, match="Invalid IP address"):
             validate_ip_address("172.16.0.300")
 
     def test_requires_id_no_id_in_args_or_kwargs(self):
         """Test requires_id decorator when ID is not in args or kwargs"""
-        from firecracker.utils import requires_id
-
         @requires_id
         def test_func(self, id=None):
             return id
 
         with pytest.raises(RuntimeError, match="VMM ID required"):
             test_func(None)
+
+    def test_get_public_ip_is_cached(self):
+        """Test get_public_ip reuses a recent lookup instead of querying again"""
+        with patch.dict(utils._public_ip_cache, time=0.0, ip=None):
+            with patch.object(utils, "_try_get_ip_from_url", return_value="203.0.113.7") as mock_get:
+                assert utils.get_public_ip() == "203.0.113.7"
+                assert utils.get_public_ip() == "203.0.113.7"
+
+            mock_get.assert_called_once()
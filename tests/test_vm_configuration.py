@@ -8,13 +8,7 @@ import pytest
 from firecracker import MicroVM
 from firecracker.exceptions import VMMError
 
-KERNEL_FILE = "/var/lib/firecracker/vmlinux-6.1.159"
-BASE_ROOTFS = "/var/lib/firecracker/devsecops-box.img"
-
-
-def check_kvm_available():
-    """Check if KVM is available and accessible."""
-    return os.path.exists("/dev/kvm") and os.access("/dev/kvm", os.R_OK | os.W_OK)
+from _helpers import BASE_ROOTFS, KERNEL_FILE, check_kvm_available
 
 
 class TestVMConfigurationValidation:
@@ -49,26 +43,27 @@ class TestVMConfigurationValidation:
         with pytest.raises(ValueError, match="vcpu must be a positive integer"):
             MicroVM(vcpu=0, kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
 
-    def test_vmm_creation_with_valid_ip_ranges(self):
-        """Test VM creation with various valid IP ranges"""
-        valid_ips = [
+    @pytest.mark.parametrize(
+        "ip",
+        [
             "172.16.0.14",  # Private Class B
             "192.168.1.15",  # Private Class C
             "10.0.0.16",  # Private Class A
             "169.254.1.17",  # Link-local address
-        ]
-
-        for ip in valid_ips:
-            vm = MicroVM(ip_addr=ip, kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
-            assert vm._ip_addr == ip, f"IP address mismatch for {ip}"
-
-            # Verify gateway IP derivation
-            gateway_parts = ip.split(".")
-            gateway_parts[-1] = "1"
-            expected_gateway = ".".join(gateway_parts)
-            assert vm._gateway_ip == expected_gateway, (
-                f"Expected gateway IP {expected_gateway}, got {vm._gateway_ip} for IP {ip}"
-            )
+        ],
+    )
+    def test_vmm_creation_with_valid_ip_ranges(self, ip):
+        """Test VM creation with various valid IP ranges"""
+        vm = MicroVM(ip_addr=ip, kernel_file=KERNEL_FILE, base_rootfs=BASE_ROOTFS)
+        assert vm._ip_addr == ip, f"IP address mismatch for {ip}"
+
+        # Verify gateway IP derivation
+        gateway_parts = ip.split(".")
+        gateway_parts[-1] = "1"
+        expected_gateway = ".".join(gateway_parts)
+        assert vm._gateway_ip == expected_gateway, (
+            f"Expected gateway IP {expected_gateway}, got {vm._gateway_ip} for IP {ip}"
+        )
 
 
 class TestVMConfiguration:
@@ -7,222 +7,293 @@ This script checks for:
 - Rootfs image exists and is valid
 - SSH key files exist
 - Correct file permissions
+
+The rootfs is only checked for an ext4 superblock by default; pass --deep to
+run a full read-only e2fsck over the image as well.
 """
 
+import argparse
+import io
 import os
+import shutil
+import stat
+import subprocess
 import sys
-from pathlib import Path
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# ext2/3/4 superblock magic, stored 56 bytes into the superblock at offset 1024
+EXT4_MAGIC_OFFSET = 1024 + 56
+EXT4_MAGIC = b"\x53\xef"
+
+KeyLocation = namedtuple("KeyLocation", ["path", "description"])
+
+# Candidate locations, checked in order
+PRIVATE_KEYS = (
+    KeyLocation("ssh_keys/ubuntu-22.04", "Primary SSH private key"),
+    KeyLocation(
+        "firecracker-files/ubuntu-22.04.id_rsa",
+        "Alternative SSH private key (firecracker-files/)",
+    ),
+)
+PUBLIC_KEYS = (KeyLocation("ssh_keys/ubuntu-22.04.pub", "Primary SSH public key"),)
+FIRECRACKER_PATHS = ("/usr/local/bin/firecracker", "/usr/bin/firecracker")
+
+KERNEL_PATH = "firecracker-files/vmlinux-6.1.159"
+ROOTFS_PATH = "firecracker-files/rootfs.img"
+
+# Lines of e2fsck diagnostics kept for the report when --deep fails
+E2FSCK_TAIL_LINES = 20
+
+# The effective UID cannot change while the script runs
+_EUID = os.geteuid()
+
+# Each path is stat()ed once and the result reused by every check
+_stat_cache = {}
+
+
+def cached_stat(path):
+    """Return os.stat(path), or None if it does not exist, memoized per path."""
+    if path not in _stat_cache:
+        try:
+            _stat_cache[path] = os.stat(path)
+        except FileNotFoundError:
+            _stat_cache[path] = None
+    return _stat_cache[path]
 
 
-def check_file(path, description, should_be_executable=False):
+def can_access(path, st, owner_bit, mode):
+    """Check access to path from its owner mode bits when we own it.
+
+    Anything else (root, group or other permissions) is left to os.access.
+    """
+    if st.st_uid == _EUID and st.st_uid != 0:
+        return bool(st.st_mode & owner_bit)
+    return os.access(path, mode)
+
+
+def check_file(path, description, out, should_be_executable=False):
     """Check if a file exists and has correct properties."""
-    if not Path(path).exists():
-        print(f"❌ {description}: NOT FOUND - {path}")
+    st = cached_stat(path)
+    if st is None:
+        print(f"❌ {description}: NOT FOUND - {path}", file=out)
         return False
 
     if should_be_executable:
-        if not os.access(path, os.X_OK):
-            print(f"❌ {description}: NOT EXECUTABLE - {path}")
+        if not can_access(path, st, stat.S_IXUSR, os.X_OK):
+            print(f"❌ {description}: NOT EXECUTABLE - {path}", file=out)
             return False
-        print(f"✅ {description}: Found and executable - {path}")
+        print(f"✅ {description}: Found and executable - {path}", file=out)
     else:
-        if not os.access(path, os.R_OK):
-            print(f"❌ {description}: NOT READABLE - {path}")
+        if not can_access(path, st, stat.S_IRUSR, os.R_OK):
+            print(f"❌ {description}: NOT READABLE - {path}", file=out)
             return False
-        print(f"✅ {description}: Found and readable - {path}")
+        print(f"✅ {description}: Found and readable - {path}", file=out)
 
     # Check file size
-    size = Path(path).stat().st_size
-    size_mb = size / (1024 * 1024)
-    print(f"   Size: {size_mb:.2f} MB")
+    size_mb = st.st_size / (1024 * 1024)
+    print(f"   Size: {size_mb:.2f} MB", file=out)
 
     # Check permissions
-    perms = oct(os.stat(path).st_mode)[-3:]
-    print(f"   Permissions: {perms}")
+    print(f"   Permissions: {st.st_mode & 0o777:03o}", file=out)
 
     return True
 
 
-def check_ssh_keys():
+def check_ssh_keys(out):
     """Check SSH key files."""
-    print("\n🔑 Checking SSH Keys...")
+    print("\n🔑 Checking SSH Keys...", file=out)
 
     # Check for private key (multiple possible locations)
-    private_key_options = [
-        ("ssh_keys/ubuntu-22.04", "Primary SSH private key"),
-        (
-            "firecracker-files/ubuntu-22.04.id_rsa",
-            "Alternative SSH private key (firecracker-files/)",
-        ),
-    ]
-
     private_key_found = None
-    for key_path, desc in private_key_options:
-        if Path(key_path).exists():
+    for key_path, desc in PRIVATE_KEYS:
+        st = cached_stat(key_path)
+        if st is not None:
             private_key_found = key_path
-            print(f"✅ SSH Private Key: {key_path}")
-            print(f"   Type: {desc}")
+            print(f"✅ SSH Private Key: {key_path}", file=out)
+            print(f"   Type: {desc}", file=out)
 
             # Check permissions (should be 600)
-            perms = oct(os.stat(key_path).st_mode)[-3:]
-            if perms != "600":
-                print(f"   ⚠️  Warning: Permissions are {perms} (recommended: 600)")
+            mode = st.st_mode & 0o777
+            if mode != 0o600:
+                print(
+                    f"   ⚠️  Warning: Permissions are {mode:03o} (recommended: 600)",
+                    file=out,
+                )
             else:
-                print(f"   Permissions: {perms} ✓")
+                print(f"   Permissions: {mode:03o} ✓", file=out)
             break
 
     if not private_key_found:
-        print("❌ SSH Private Key: NOT FOUND")
-        print("   Expected locations:")
-        for key_path, desc in private_key_options:
-            print(f"     - {key_path} ({desc})")
+        print("❌ SSH Private Key: NOT FOUND", file=out)
+        print("   Expected locations:", file=out)
+        for key_path, desc in PRIVATE_KEYS:
+            print(f"     - {key_path} ({desc})", file=out)
         return False
 
     # Check for public key
-    public_key_options = [
-        ("ssh_keys/ubuntu-22.04.pub", "Primary SSH public key"),
-        ("ssh_keys/ubuntu-22.04.pub", "Alternative SSH public key"),
-    ]
-
     public_key_found = None
-    for key_path, desc in public_key_options:
-        if Path(key_path).exists():
+    for key_path, desc in PUBLIC_KEYS:
+        st = cached_stat(key_path)
+        if st is not None:
             public_key_found = key_path
-            print(f"✅ SSH Public Key: {key_path}")
-            print(f"   Type: {desc}")
+            print(f"✅ SSH Public Key: {key_path}", file=out)
+            print(f"   Type: {desc}", file=out)
 
             # Check permissions (should be 644)
-            perms = oct(os.stat(key_path).st_mode)[-3:]
-            if perms != "644":
-                print(f"   ⚠️  Warning: Permissions are {perms} (recommended: 644)")
+            mode = st.st_mode & 0o777
+            if mode != 0o644:
+                print(
+                    f"   ⚠️  Warning: Permissions are {mode:03o} (recommended: 644)",
+                    file=out,
+                )
             else:
-                print(f"   Permissions: {perms} ✓")
+                print(f"   Permissions: {mode:03o} ✓", file=out)
             break
 
     if not public_key_found:
-        print("❌ SSH Public Key: NOT FOUND")
+        print("❌ SSH Public Key: NOT FOUND", file=out)
         return False
 
     print(
-        f"\n📝 Recommended SSH connection path: ssh -i {private_key_found} root@<VM_IP>"
+        f"\n📝 Recommended SSH connection path: ssh -i {private_key_found} root@<VM_IP>",
+        file=out,
     )
     return True
 
 
-def check_kernel():
+def check_kernel(out):
     """Check kernel file."""
-    print("\n🐧 Checking Kernel...")
+    print("\n🐧 Checking Kernel...", file=out)
 
-    kernel_path = "firecracker-files/vmlinux-6.1.159"
-    return check_file(kernel_path, "Firecracker Kernel", should_be_executable=True)
+    return check_file(KERNEL_PATH, "Firecracker Kernel", out, should_be_executable=True)
 
 
-def check_rootfs():
-    """Check rootfs image."""
-    print("\n💾 Checking Rootfs Image...")
+def check_rootfs(out, deep=False):
+    """Check rootfs image, running e2fsck over it only when deep is set."""
+    print("\n💾 Checking Rootfs Image...", file=out)
 
-    rootfs_path = "firecracker-files/rootfs.img"
-
-    if not Path(rootfs_path).exists():
-        print(f"❌ Rootfs: NOT FOUND - {rootfs_path}")
+    st = cached_stat(ROOTFS_PATH)
+    if st is None:
+        print(f"❌ Rootfs: NOT FOUND - {ROOTFS_PATH}", file=out)
         return False
 
-    print(f"✅ Rootfs: Found - {rootfs_path}")
-
-    # Check if it's a valid ext4 filesystem
-    import subprocess
+    print(f"✅ Rootfs: Found - {ROOTFS_PATH}", file=out)
 
+    # Check for an ext4 superblock without reading the rest of the image
     try:
-        result = subprocess.run(
-            ["e2fsck", "-fn", rootfs_path], capture_output=True, text=True
-        )
-        if result.returncode == 0:
-            print("✅ Rootfs: Valid ext4 filesystem")
+        with open(ROOTFS_PATH, "rb") as f:
+            f.seek(EXT4_MAGIC_OFFSET)
+            magic = f.read(len(EXT4_MAGIC))
+        if magic == EXT4_MAGIC:
+            print("✅ Rootfs: ext4 superblock found", file=out)
         else:
-            print(f"⚠️  Warning: Could not validate ext4 filesystem")
-            print(f"   Output: {result.stderr}")
-    except FileNotFoundError:
-        print("⚠️  Warning: e2fsck not found (rootfs may still be valid)")
+            print("⚠️  Warning: No ext4 superblock found in rootfs image", file=out)
+    except OSError as e:
+        print(f"⚠️  Warning: Could not read rootfs image: {e}", file=out)
+
+    # Full filesystem check, which reads much of the image
+    if deep:
+        try:
+            # Stream diagnostics rather than buffering them, keeping only the tail
+            with subprocess.Popen(
+                ["e2fsck", "-fn", ROOTFS_PATH],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            ) as proc:
+                stderr_tail = deque(proc.stderr, maxlen=E2FSCK_TAIL_LINES)
+            if proc.returncode == 0:
+                print("✅ Rootfs: Valid ext4 filesystem", file=out)
+            else:
+                print(f"⚠️  Warning: Could not validate ext4 filesystem", file=out)
+                print(f"   Output: {''.join(stderr_tail)}", file=out)
+        except FileNotFoundError:
+            print("⚠️  Warning: e2fsck not found (rootfs may still be valid)", file=out)
 
     # Check file size
-    size = Path(rootfs_path).stat().st_size
-    size_gb = size / (1024 * 1024 * 1024)
-    print(f"   Size: {size_gb:.2f} GB")
+    size_gb = st.st_size / (1024 * 1024 * 1024)
+    print(f"   Size: {size_gb:.2f} GB", file=out)
 
     return True
 
 
-def check_prerequisites():
+def check_prerequisites(out):
     """Check system prerequisites."""
-    print("\n🔧 Checking Prerequisites...")
+    print("\n🔧 Checking Prerequisites...", file=out)
 
     all_good = True
 
-    # Check Firecracker binary
-    firecracker_paths = [
-        "/usr/local/bin/firecracker",
-        "/usr/bin/firecracker",
-    ]
-
-    firecracker_found = False
-    for path in firecracker_paths:
-        if Path(path).exists():
-            print(f"✅ Firecracker binary: {path}")
-            firecracker_found = True
-            break
-
-    if not firecracker_found:
-        print("❌ Firecracker binary: NOT FOUND")
-        print("   Expected locations:")
-        for path in firecracker_paths:
-            print(f"     - {path}")
+    # Check Firecracker binary, on PATH first and then in the usual locations
+    firecracker_path = shutil.which("firecracker") or next(
+        (path for path in FIRECRACKER_PATHS if cached_stat(path) is not None), None
+    )
+    if firecracker_path:
+        print(f"✅ Firecracker binary: {firecracker_path}", file=out)
+    else:
+        print("❌ Firecracker binary: NOT FOUND", file=out)
+        print("   Expected on PATH or in:", file=out)
+        for path in FIRECRACKER_PATHS:
+            print(f"     - {path}", file=out)
         all_good = False
 
-    # Check KVM
+    # Check KVM (read the module list lsmod would print, without running it)
     try:
-        result = subprocess.run(["lsmod"], capture_output=True, text=True)
-        if "kvm" in result.stdout.lower():
-            print("✅ KVM module: Loaded")
+        with open("/proc/modules", "r") as f:
+            modules = f.read()
+        if any(line.startswith("kvm") for line in modules.splitlines()):
+            print("✅ KVM module: Loaded", file=out)
         else:
-            print("❌ KVM module: NOT LOADED")
-            print("   Run: sudo modprobe kvm_intel or kvm_amd")
+            print("❌ KVM module: NOT LOADED", file=out)
+            print("   Run: sudo modprobe kvm_intel or kvm_amd", file=out)
             all_good = False
     except Exception:
-        print("⚠️  Warning: Could not check KVM status")
+        print("⚠️  Warning: Could not check KVM status", file=out)
 
-    # Check Docker
-    try:
-        result = subprocess.run(
-            ["docker", "--version"],
-            capture_output=True,
-            text=True,
-            stderr=subprocess.PIPE,
+    # Check Docker (locate the CLI on PATH rather than starting it)
+    docker_path = shutil.which("docker")
+    if docker_path:
+        print("✅ Docker: Installed", file=out)
+        print(f"   Location: {docker_path}", file=out)
+    else:
+        print(
+            "⚠️  Warning: Docker not installed (may need for custom rootfs)",
+            file=out,
         )
-        if result.returncode == 0:
-            print("✅ Docker: Installed")
-            print(f"   Version: {result.stdout.strip().split()[0]}")
-        else:
-            print("⚠️  Warning: Docker not installed (may need for custom rootfs)")
-    except Exception:
-        print("⚠️  Warning: Could not check Docker status")
 
-    # Check IP forwarding
+    # Check IP forwarding (the sysctl is a single digit, so read raw bytes)
     try:
-        with open("/proc/sys/net/ipv4/ip_forward", "r") as f:
-            ip_forward = f.read().strip()
-            if ip_forward == "1":
-                print("✅ IP forwarding: Enabled")
-            else:
-                print("⚠️  Warning: IP forwarding not enabled")
-                print("   Run: sudo sh -c 'echo 1 > /proc/sys/net/ipv4/ip_forward'")
+        fd = os.open("/proc/sys/net/ipv4/ip_forward", os.O_RDONLY)
+        try:
+            ip_forward = os.read(fd, 2)
+        finally:
+            os.close(fd)
+        if ip_forward[:1] == b"1":
+            print("✅ IP forwarding: Enabled", file=out)
+        else:
+            print("⚠️  Warning: IP forwarding not enabled", file=out)
+            print(
+                "   Run: sudo sh -c 'echo 1 > /proc/sys/net/ipv4/ip_forward'",
+                file=out,
+            )
     except Exception:
-        print("⚠️  Warning: Could not check IP forwarding")
+        print("⚠️  Warning: Could not check IP forwarding", file=out)
 
     return all_good
 
 
 def main():
     """Main verification function."""
+    parser = argparse.ArgumentParser(
+        description="Check that the Firecracker setup is complete."
+    )
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="also run a full read-only e2fsck over the rootfs image (slow)",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("  Firecracker Setup Verification")
     print("=" * 60)
@@ -230,46 +301,70 @@ def main():
         "\nThis script checks that all required files are in place for Firecracker.\n"
     )
 
-    results = {
-        "Kernel": check_kernel(),
-        "Rootfs": check_rootfs(),
-        "SSH Keys": check_ssh_keys(),
-        "Prerequisites": check_prerequisites(),
+    checks = {
+        "Kernel": (check_kernel, {}),
+        "Rootfs": (check_rootfs, {"deep": args.deep}),
+        "SSH Keys": (check_ssh_keys, {}),
+        "Prerequisites": (check_prerequisites, {}),
     }
 
-    print("\n" + "=" * 60)
-    print("  Summary")
-    print("=" * 60)
+    # The checks are independent and mostly wait on I/O, so run them
+    # together; each writes to its own buffer, printed in order afterwards
+    outputs = {name: io.StringIO() for name in checks}
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = {
+            name: executor.submit(check, outputs[name], **kwargs)
+            for name, (check, kwargs) in checks.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+    # Assemble the rest of the report and write it to stdout in one go
+    report = io.StringIO()
+    for output in outputs.values():
+        report.write(output.getvalue())
+
+    print("\n" + "=" * 60, file=report)
+    print("  Summary", file=report)
+    print("=" * 60, file=report)
 
     for name, passed in results.items():
         status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"{status}: {name}")
+        print(f"{status}: {name}", file=report)
 
-    print("\n" + "=" * 60)
+    print("\n" + "=" * 60, file=report)
+
+    all_passed = all(results.values())
 
     # Provide next steps
-    if all(results.values()):
-        print("\n🎉 All checks passed! You're ready to run Firecracker.")
-        print("\nNext steps:")
-        print("  1. Enable IP forwarding if not already enabled:")
-        print("     sudo sh -c 'echo 1 > /proc/sys/net/ipv4/ip_forward'")
-        print("     sudo iptables -P FORWARD ACCEPT")
-        print("\n  2. Run the sample script:")
-        print("     ./examples/sample.py")
-        print("\n  3. Or create a VM programmatically:")
+    if all_passed:
+        print("\n🎉 All checks passed! You're ready to run Firecracker.", file=report)
+        print("\nNext steps:", file=report)
+        print("  1. Enable IP forwarding if not already enabled:", file=report)
+        print("     sudo sh -c 'echo 1 > /proc/sys/net/ipv4/ip_forward'", file=report)
+        print("     sudo iptables -P FORWARD ACCEPT", file=report)
+        print("\n  2. Run the sample script:", file=report)
+        print("     ./examples/sample.py", file=report)
+        print("\n  3. Or create a VM programmatically:", file=report)
         print(
-            '     python3 -c "from firecracker import MicroVM; vm = MicroVM(); vm.create()"'
+            '     python3 -c "from firecracker import MicroVM; vm = MicroVM(); vm.create()"',
+            file=report,
         )
     else:
-        print("\n⚠️  Some checks failed. Please fix the issues above before continuing.")
-        print("\nTroubleshooting tips:")
         print(
-            "  - Re-run the setup script: ./assets/rootfs/setup-firecracker-official.sh"
+            "\n⚠️  Some checks failed. Please fix the issues above before continuing.",
+            file=report,
+        )
+        print("\nTroubleshooting tips:", file=report)
+        print(
+            "  - Re-run the setup script: ./assets/rootfs/setup-firecracker-official.sh",
+            file=report,
         )
-        print("  - Check QUICKSTART.md for detailed instructions")
-        print("  - Read README.md for documentation")
+        print("  - Check QUICKSTART.md for detailed instructions", file=report)
+        print("  - Read README.md for documentation", file=report)
+
+    sys.stdout.write(report.getvalue())
 
-    return 0 if all(results.values()) else 1
+    return 0 if all_passed else 1
 
 
 if __name__ == "__main__":